@@ -5,15 +5,15 @@ Orchestrates AI agents to create video reels from news summaries
 
 import os
 import logging
+import threading
 import uuid
 from datetime import datetime, timezone
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
-from pathlib import Path
-import sys
+from dotenv import load_dotenv
 
-# Add orchestrator_agent to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Load environment variables before anything reads them
+load_dotenv()
 
 from orchestrator_agent_reel import OrchestratorAgent
 from orchestrator_agent_reel.utils.gcs_storage import GCSStorage
@@ -29,10 +29,6 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
-
 # Configuration
 GCP_PROJECT_ID = os.getenv('GCP_PROJECT_ID')
 GCS_BUCKET_NAME = os.getenv('GCS_BUCKET_NAME')
@@ -118,7 +114,6 @@ def generate_reel():
         logger.info(f"🎞️ Scenes: {num_scenes}")
         
         # Start generation in background (for now, synchronous - we'll make it async later)
-        import threading
         thread = threading.Thread(
             target=process_reel_generation,
             args=(job_id, news_summary, num_scenes)
@@ -174,10 +169,7 @@ def process_reel_generation(job_id: str, news_summary: str, num_scenes: int):
             try:
                 video_filename = f"reels/reel_{job_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.mp4"
                 
-                with open(video_path, 'rb') as video_file:
-                    video_data = video_file.read()
-                
-                video_url = gcs_storage.upload_video(video_data, video_filename)
+                video_url = gcs_storage.upload_video_file(video_path, video_filename)
                 logger.info(f"✅ Uploaded to GCS: {video_url}")
                 
                 # Clean up local file after successful upload
@@ -300,7 +292,7 @@ def auto_generate_news_reels():
         max_articles = data.get('max_articles', 5)
         num_scenes = data.get('num_scenes', 8)
         
-        logger.info(f"🚀 Auto-generating reels for {max_articles} news articles (ONE AT A TIME)")
+        logger.info(f"🚀 Auto-generating reels for {max_articles} news articles")
         
         # Fetch and summarize news
         news_articles = orchestrator.news_fetcher.fetch_and_summarize_news(
@@ -313,41 +305,36 @@ def auto_generate_news_reels():
         if not news_articles:
             return jsonify({'error': 'No news articles found'}), 404
         
-        # Create job for FIRST article only (sequential processing)
-        first_article = news_articles[0]
-        job_id = str(uuid.uuid4())
-        article_id = first_article.get('article_id', job_id)
-        
-        jobs[job_id] = {
-            'job_id': job_id,
-            'article_id': article_id,
-            'status': 'processing',
-            'progress': 0,
-            'current_step': 'Queued...',
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'news_summary': first_article['summary'][:100] + '...',
-            'num_scenes': num_scenes,
-            'article_title': first_article['original']['title'],
-            'article_source': first_article['original']['source'],
-            'remaining_articles': news_articles[1:],  # Store remaining for sequential processing
-            'current_index': 0,
-            'total_articles': len(news_articles)
-        }
+        # One job per article; all reels are generated as a single pipeline
+        job_ids = []
+        for article in news_articles:
+            job_id = str(uuid.uuid4())
+            jobs[job_id] = {
+                'job_id': job_id,
+                'article_id': article.get('article_id', job_id),
+                'status': 'processing',
+                'progress': 0,
+                'current_step': 'Queued...',
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'news_summary': article['summary'][:100] + '...',
+                'num_scenes': num_scenes,
+                'article_title': article['original']['title'],
+                'article_source': article['original']['source']
+            }
+            job_ids.append(job_id)
         
-        # Start generation for FIRST article only
-        import threading
         thread = threading.Thread(
-            target=process_news_reel_generation,
-            args=(job_id, first_article, num_scenes, news_articles[1:])  # Pass remaining articles
+            target=process_news_reels_pipeline,
+            args=(job_ids, news_articles, num_scenes)
         )
         thread.start()
         
-        logger.info(f"✅ Started generating reel 1 of {len(news_articles)}")
+        logger.info(f"✅ Started generating {len(news_articles)} reels")
         
         return jsonify({
             'success': True,
-            'message': f'Generating reel 1 of {len(news_articles)}',
-            'job_ids': [job_id],  # Only return first job ID
+            'message': f'Generating {len(news_articles)} reels',
+            'job_ids': job_ids,
             'total_articles': len(news_articles)
         }), 202
         
@@ -355,25 +342,41 @@ def auto_generate_news_reels():
         logger.error(f"❌ Error in auto_generate_news_reels: {e}")
         return jsonify({'error': str(e)}), 500
 
-def process_news_reel_generation(job_id: str, article_data: dict, num_scenes: int, remaining_articles: list = None):
-    """Background process for news reel generation (sequential)"""
+def process_news_reels_pipeline(job_ids: list, articles: list, num_scenes: int):
+    """Background process generating all news reels through the orchestrator pipeline"""
     try:
-        news_summary = article_data['summary']
-        article_info = article_data['original']
-        
-        # Update job status
-        jobs[job_id].update({
-            'status': 'processing',
-            'progress': 10,
-            'current_step': 'Generating script with Gemini...'
-        })
+        for job_id in job_ids:
+            jobs[job_id].update({
+                'status': 'processing',
+                'progress': 10,
+                'current_step': 'Generating script and images...'
+            })
         
-        # Generate reel
-        result = orchestrator.generate_reel(
-            news_summary=news_summary,
-            num_scenes=num_scenes
+        # Auto news reels are non-interactive, so use batch mode
+        orchestrator.generate_reels_for_articles(
+            articles,
+            num_scenes=num_scenes,
+            use_batch_api=True,
+            on_reel=lambda index, result: finish_news_reel(job_ids[index], articles[index], result)
         )
         
+    except Exception as e:
+        logger.error(f"❌ Error processing news reels: {e}")
+        for job_id in job_ids:
+            if jobs[job_id]['status'] == 'processing':
+                jobs[job_id].update({
+                    'status': 'failed',
+                    'progress': 0,
+                    'error': str(e),
+                    'current_step': 'Failed'
+                })
+
+def finish_news_reel(job_id: str, article_data: dict, result: dict):
+    """Upload a finished news reel and record it"""
+    try:
+        news_summary = article_data['summary']
+        article_info = article_data['original']
+        
         if not result.get('success'):
             jobs[job_id].update({
                 'status': 'failed',
@@ -396,10 +399,7 @@ def process_news_reel_generation(job_id: str, article_data: dict, num_scenes: in
             try:
                 video_filename = f"news_reels/reel_{job_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.mp4"
                 
-                with open(video_path, 'rb') as video_file:
-                    video_data = video_file.read()
-                
-                video_url = gcs_storage.upload_video(video_data, video_filename)
+                video_url = gcs_storage.upload_video_file(video_path, video_filename)
                 logger.info(f"✅ News reel uploaded to GCS: {video_url}")
                 
                 # Clean up local file after successful upload
@@ -443,36 +443,6 @@ def process_news_reel_generation(job_id: str, article_data: dict, num_scenes: in
         
         logger.info(f"✅ News reel {job_id} completed successfully")
         
-        # Process next article if any remaining
-        if remaining_articles and len(remaining_articles) > 0:
-            next_article = remaining_articles[0]
-            next_remaining = remaining_articles[1:]
-            
-            logger.info(f"🎬 Starting next reel ({len(remaining_articles)} remaining)...")
-            
-            # Create new job for next article
-            next_job_id = str(uuid.uuid4())
-            jobs[next_job_id] = {
-                'job_id': next_job_id,
-                'article_id': next_article.get('article_id'),
-                'status': 'processing',
-                'progress': 0,
-                'current_step': 'Queued...',
-                'created_at': datetime.now(timezone.utc).isoformat(),
-                'news_summary': next_article['summary'][:100] + '...',
-                'num_scenes': num_scenes,
-                'article_title': next_article['original']['title'],
-                'article_source': next_article['original']['source']
-            }
-            
-            # Start next generation
-            import threading
-            thread = threading.Thread(
-                target=process_news_reel_generation,
-                args=(next_job_id, next_article, num_scenes, next_remaining)
-            )
-            thread.start()
-        
     except Exception as e:
         logger.error(f"❌ Error processing news reel {job_id}: {e}")
         jobs[job_id].update({
@@ -3,6 +3,7 @@ Orchestrator Agent - Main orchestration logic
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .sub_agents import ScriptGeneratorAgent, ImageGeneratorAgent, VideoComposerAgent, NewsFetcherAgent
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,8 @@ class OrchestratorAgent:
         
         logger.info("✅ Orchestrator Agent ready")
     
-    def generate_reel(self, news_summary: str, num_scenes: int = 8, output_path: str = None) -> dict:
+    def generate_reel(self, news_summary: str, num_scenes: int = 8, output_path: str = None,
+                      use_batch_api: bool = False) -> dict:
         """
         Generate a complete news reel from a summary
         
@@ -40,6 +42,8 @@ class OrchestratorAgent:
             news_summary: The news summary text
             num_scenes: Number of scenes to generate (default: 8)
             output_path: Optional output path for video
+            use_batch_api: Generate images as one batch-mode job (cheaper,
+                slower - for reels nobody is waiting on)
             
         Returns:
             Dictionary with 'success', 'video_path', 'scenes', and 'error' keys
@@ -51,29 +55,7 @@ class OrchestratorAgent:
         logger.info(f"🎬 Target Scenes: {num_scenes}")
         
         try:
-            # Step 1: Generate script with Gemini
-            logger.info("\n" + "=" * 60)
-            logger.info("STEP 1: SCRIPT GENERATION")
-            logger.info("=" * 60)
-            
-            scenes = self.script_generator.generate_script(news_summary, num_scenes)
-            
-            if not scenes:
-                raise Exception("Script generation failed - no scenes generated")
-            
-            logger.info(f"✅ Script generated with {len(scenes)} scenes")
-            
-            # Step 2: Generate images with Imagen
-            logger.info("\n" + "=" * 60)
-            logger.info("STEP 2: IMAGE GENERATION")
-            logger.info("=" * 60)
-            
-            scene_data = self.image_generator.generate_images_batch(scenes)
-            
-            if not scene_data:
-                raise Exception("Image generation failed - no images generated")
-            
-            logger.info(f"✅ Generated {len(scene_data)} images")
+            scenes, scene_data = self._prepare_scenes(news_summary, num_scenes, use_batch_api)
             
             # Step 3: Compose video with TTS audio
             logger.info("\n" + "=" * 60)
@@ -108,3 +90,122 @@ class OrchestratorAgent:
                 'error': str(e),
                 'error_type': type(e).__name__
             }
+    
+    def _prepare_scenes(self, news_summary: str, num_scenes: int, use_batch_api: bool) -> tuple:
+        """Run script and image generation for one summary, returning (scenes, scene_data)"""
+        # Step 1: Generate script with Gemini
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 1: SCRIPT GENERATION")
+        logger.info("=" * 60)
+        
+        scenes = self.script_generator.generate_script(news_summary, num_scenes)
+        
+        if not scenes:
+            raise Exception("Script generation failed - no scenes generated")
+        
+        logger.info(f"✅ Script generated with {len(scenes)} scenes")
+        
+        # Step 2: Generate images with Imagen
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 2: IMAGE GENERATION")
+        logger.info("=" * 60)
+        
+        if use_batch_api:
+            scene_data = self.image_generator.generate_images_batch_bulk(scenes)
+        else:
+            scene_data = self.image_generator.generate_images_batch(scenes)
+        
+        if not scene_data:
+            raise Exception("Image generation failed - no images generated")
+        
+        logger.info(f"✅ Generated {len(scene_data)} images")
+        
+        return scenes, scene_data
+    
+    def generate_news_reels(self, category: str = "general", country: str = "us", max_articles: int = 5,
+                            num_scenes: int = 8, use_batch_api: bool = False) -> list:
+        """
+        Fetch top news and generate one reel per article as a pipeline
+        
+        Script and image generation run concurrently for all articles, and
+        each reel is composed as soon as its images are ready, so composing
+        one video overlaps with the Gemini/Imagen calls for the others.
+        
+        Args:
+            category: News category
+            country: Country code
+            max_articles: Maximum number of articles
+            num_scenes: Number of scenes per reel
+            use_batch_api: Generate images as batch-mode jobs
+            
+        Returns:
+            List of generate_reel-style result dictionaries, each with an
+            extra 'article' key, in completion order
+        """
+        articles = self.news_fetcher.fetch_and_summarize_news(
+            category=category,
+            country=country,
+            max_articles=max_articles,
+            summary_words=100
+        )
+        
+        if not articles:
+            logger.warning("⚠️ No articles to turn into reels")
+            return []
+        
+        return self.generate_reels_for_articles(articles, num_scenes, use_batch_api)
+    
+    def generate_reels_for_articles(self, articles: list, num_scenes: int = 8, use_batch_api: bool = False,
+                                    on_reel=None) -> list:
+        """
+        Generate one reel per already-fetched article as a pipeline
+        
+        Args:
+            articles: Summarized articles from NewsFetcherAgent.fetch_and_summarize_news
+            num_scenes: Number of scenes per reel
+            use_batch_api: Generate images as batch-mode jobs
+            on_reel: Optional callback(index, result) invoked as each reel finishes,
+                where index is the article's position in articles
+            
+        Returns:
+            List of generate_reel-style result dictionaries, each with an
+            extra 'article' key, in completion order
+        """
+        logger.info(f"🚀 Pipelining {len(articles)} news reels")
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=len(articles), thread_name_prefix='reel') as executor:
+            futures = {
+                executor.submit(self._prepare_scenes, article['summary'], num_scenes, use_batch_api): index
+                for index, article in enumerate(articles)
+            }
+            
+            # Video composition is CPU-bound, so compose one reel at a time as inputs arrive
+            for future in as_completed(futures):
+                index = futures[future]
+                article = articles[index]
+                try:
+                    scenes, scene_data = future.result()
+                    video_path = self.video_composer.compose_video(scene_data)
+                    result = {
+                        'success': True,
+                        'video_path': video_path,
+                        'scenes': scenes,
+                        'num_scenes': len(scenes),
+                        'article': article
+                    }
+                    logger.info(f"✅ Reel ready for: {article['original'].get('title', '')[:50]}")
+                except Exception as e:
+                    logger.error(f"❌ Reel failed for {article.get('article_id')}: {type(e).__name__}: {e}")
+                    result = {
+                        'success': False,
+                        'error': str(e),
+                        'error_type': type(e).__name__,
+                        'article': article
+                    }
+                
+                results.append(result)
+                if on_reel is not None:
+                    on_reel(index, result)
+        
+        return results
@@ -2,8 +2,14 @@
 News Fetcher Agent - Fetches and summarizes popular news from Google News API
 """
 
+import json
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict
 import vertexai
 from vertexai.preview.generative_models import GenerativeModel
@@ -26,6 +32,20 @@ class NewsFetcherAgent:
         self.location = location
         self.news_api_key = news_api_key
         self.model_name = "gemini-2.0-flash-exp"
+        self.max_concurrency = 5  # Parallel per-article summaries in the fallback path
+        
+        # Pooled keep-alive HTTP session for NewsAPI requests
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        ))
+        
+        # Conditional-GET cache for RSS feeds: url -> {'etag', 'modified', 'articles'}
+        self.rss_cache_path = Path(__file__).parent.parent / "cache" / "rss_cache.json"
+        self._rss_cache = self._load_rss_cache()
+        self._rss_cache_lock = threading.Lock()
         
         # Initialize Vertex AI for summarization
         vertexai.init(project=project_id, location=location)
@@ -69,7 +89,7 @@ class NewsFetcherAgent:
             'apiKey': self.news_api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = self._http.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -110,10 +130,20 @@ class NewsFetcherAgent:
         
         logger.info(f"📡 Fetching from Google News RSS: {rss_url}")
         
-        feed = feedparser.parse(rss_url)
-        articles = []
+        cached = self._rss_cache.get(rss_url)
+        feed = feedparser.parse(
+            rss_url,
+            etag=cached.get('etag') if cached else None,
+            modified=cached.get('modified') if cached else None
+        )
         
-        for entry in feed.entries[:max_articles]:
+        if cached and feed.get('status') == 304:
+            articles = cached['articles'][:max_articles]
+            logger.info(f"✅ Google News RSS unchanged, using {len(articles)} cached articles")
+            return articles
+        
+        articles = []
+        for entry in feed.entries:
             articles.append({
                 'title': entry.get('title', ''),
                 'description': entry.get('summary', ''),
@@ -124,9 +154,36 @@ class NewsFetcherAgent:
                 'image_url': ''
             })
         
+        if articles and (feed.get('etag') or feed.get('modified')):
+            self._store_rss_cache(rss_url, {
+                'etag': feed.get('etag'),
+                'modified': feed.get('modified'),
+                'articles': articles
+            })
+        
+        articles = articles[:max_articles]
         logger.info(f"✅ Fetched {len(articles)} articles from Google News RSS")
         return articles
     
+    def _load_rss_cache(self) -> Dict:
+        """Load the persisted RSS cache, if any"""
+        try:
+            with open(self.rss_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+    
+    def _store_rss_cache(self, url: str, entry: Dict):
+        """Update the RSS cache for one feed and persist it to disk"""
+        with self._rss_cache_lock:
+            self._rss_cache[url] = entry
+            try:
+                self.rss_cache_path.parent.mkdir(exist_ok=True)
+                with open(self.rss_cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._rss_cache, f, ensure_ascii=False)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not persist RSS cache: {e}")
+    
     def summarize_article(self, article: Dict, max_words: int = 100) -> str:
         """
         Summarize a news article using Gemini
@@ -169,6 +226,66 @@ Summary:"""
             # Fallback to title + description
             return f"{article.get('title', '')}. {article.get('description', '')}"
     
+    def summarize_articles(self, articles: List[Dict], max_words: int = 100) -> List[str]:
+        """
+        Summarize several news articles with a single Gemini call
+        
+        Args:
+            articles: Article dictionaries with 'title', 'description', 'content'
+            max_words: Maximum words per summary
+            
+        Returns:
+            Summaries in the same order as ``articles``
+        """
+        if not articles:
+            return []
+        
+        logger.info(f"📝 Summarizing {len(articles)} articles in one request...")
+        
+        try:
+            payload = [
+                {
+                    'article_id': i,
+                    'title': article.get('title', ''),
+                    'description': article.get('description', ''),
+                    'content': article.get('content', '')
+                }
+                for i, article in enumerate(articles)
+            ]
+            
+            prompt = f"""Summarize each of the following {len(articles)} news articles in approximately {max_words} words.
+Make each summary engaging, informative, and suitable for a short video reel. Focus on the key facts and important details.
+
+Return a JSON array with one object per article: [{{"article_id": <id>, "summary": "<text>"}}]
+
+Articles:
+{json.dumps(payload, ensure_ascii=False)}"""
+            
+            response = self.model.generate_content(
+                prompt,
+                generation_config={"response_mime_type": "application/json"}
+            )
+            
+            summaries = {
+                int(item['article_id']): item['summary'].strip()
+                for item in json.loads(response.text)
+            }
+            
+            if set(summaries) != set(range(len(articles))):
+                raise ValueError(f"expected {len(articles)} summaries, got ids {sorted(summaries)}")
+            
+            logger.info(f"✅ Summarized {len(summaries)} articles in one request")
+            return [summaries[i] for i in range(len(articles))]
+            
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Batch summary unusable ({type(e).__name__}: {e}), summarizing per article")
+        except Exception as e:
+            logger.error(f"❌ Error in batch summarization: {str(e)}")
+        
+        # Overlap the per-article requests; map() keeps the input order
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(articles))) as executor:
+            return list(executor.map(lambda article: self.summarize_article(article, max_words), articles))
+    
     def fetch_and_summarize_news(self, 
                                  category: str = "general", 
                                  country: str = "us", 
@@ -197,12 +314,11 @@ Summary:"""
             logger.warning("⚠️ No articles fetched")
             return []
         
-        # Summarize each article
+        # Summarize all articles together
+        summaries = self.summarize_articles(articles, summary_words)
+        
         results = []
-        for i, article in enumerate(articles, 1):
-            logger.info(f"\n📰 Processing article {i}/{len(articles)}")
-            summary = self.summarize_article(article, summary_words)
-            
+        for i, (article, summary) in enumerate(zip(articles, summaries), 1):
             results.append({
                 'original': article,
                 'summary': summary,
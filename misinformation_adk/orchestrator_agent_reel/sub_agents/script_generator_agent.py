@@ -9,6 +9,21 @@ from vertexai.preview.generative_models import GenerativeModel
 
 logger = logging.getLogger(__name__)
 
+# Structured-output schema for the scene list Gemini returns
+SCENE_LIST_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "scene_number": {"type": "INTEGER"},
+            "image_prompt": {"type": "STRING"},
+            "narration": {"type": "STRING"},
+            "duration": {"type": "INTEGER"},
+        },
+        "required": ["scene_number", "image_prompt", "narration", "duration"],
+    },
+}
+
 class ScriptGeneratorAgent:
     """Agent that generates structured scripts for individual images from news summary"""
     
@@ -57,26 +72,17 @@ For each scene, provide:
 Make sure the total narration covers the entire news summary and each image_prompt creates visually distinct, compelling imagery suitable for news.
 
 News Summary:
-{news_summary}
-
-Return ONLY a valid JSON array with this exact structure:
-[
-  {{
-    "scene_number": 1,
-    "image_prompt": "detailed visual description",
-    "narration": "text to be spoken",
-    "duration": 4
-  }}
-]
-
-JSON Output:"""
+{news_summary}"""
             
-            # Generate content with Gemini
+            # Generate content with Gemini, constrained to the scene list schema
+            response_text = ""
             response = self.model.generate_content(
                 prompt,
                 generation_config={
                     "temperature": 0.7,
                     "max_output_tokens": 2048,
+                    "response_mime_type": "application/json",
+                    "response_schema": SCENE_LIST_SCHEMA,
                 }
             )
             
@@ -84,15 +90,7 @@ JSON Output:"""
             if response and response.text:
                 logger.info("✅ Script generated successfully")
                 
-                # Try to parse JSON from response
-                response_text = response.text.strip()
-                
-                # Remove markdown code blocks if present
-                if response_text.startswith("```json"):
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif response_text.startswith("```"):
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
-                
+                response_text = response.text
                 scenes = json.loads(response_text)
                 
                 logger.info(f"📋 Generated {len(scenes)} scenes")
@@ -2,9 +2,17 @@
 Video Composer Agent - Creates synced video reels with images and audio
 """
 
+import functools
+import hashlib
 import logging
+import subprocess
 import tempfile
 import os
+import threading
+import uuid
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Try to import TTS, make it optional
@@ -15,13 +23,135 @@ except ImportError:
     texttospeech = None
     TTS_AVAILABLE = False
 
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips, CompositeAudioClip, TextClip, CompositeVideoClip
+from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips, CompositeAudioClip
+import imageio_ffmpeg
 import numpy as np
 from PIL import Image
 import io
 
 logger = logging.getLogger(__name__)
 
+# ffmpeg binary bundled with imageio-ffmpeg (the same one MoviePy uses)
+FFMPEG_BINARY = imageio_ffmpeg.get_ffmpeg_exe()
+
+# Still-image slideshow encode: fast preset, fixed 2s GOP, no scene-cut analysis,
+# frame-threaded across all cores
+X264_PARAMS = [
+    '-preset', 'veryfast',
+    '-tune', 'stillimage',
+    '-crf', '23',
+    '-pix_fmt', 'yuv420p',
+    '-x264-params', 'keyint=48:min-keyint=48:no-scenecut=1:threads=auto:sliced-threads=0',
+]
+
+# Candidate bold fonts for the burned-in watermark, first match wins
+WATERMARK_FONT_CANDIDATES = [
+    os.getenv('WATERMARK_FONT_FILE'),
+    'C:/Windows/Fonts/arialbd.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+    '/usr/share/fonts/truetype/msttcorefonts/Arial_Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+]
+
+
+def _image_format(image_bytes: bytes) -> str:
+    """Container format from the image's magic bytes ('png', 'jpeg', 'webp'), or None"""
+    if image_bytes[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if image_bytes[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def _image_suffix(image_bytes: bytes) -> str:
+    """File extension matching the image's magic bytes"""
+    return {'jpeg': '.jpg', 'webp': '.webp'}.get(_image_format(image_bytes), '.png')
+
+
+def _raw_frame_size(scene: dict) -> tuple:
+    """
+    Frame size of a scene whose image_bytes are already-decoded RGB24 pixels
+    
+    Args:
+        scene: Scene dictionary, with 'width' and 'height' for raw frames
+        
+    Returns:
+        (width, height) for raw frames, None for encoded images
+    """
+    image_bytes = scene.get('image_bytes')
+    width, height = scene.get('width'), scene.get('height')
+    if _image_format(image_bytes) is None and width and height and len(image_bytes) == width * height * 3:
+        return width, height
+    return None
+
+
+def _audio_suffix(audio_bytes: bytes) -> str:
+    """File extension matching the audio's magic bytes (WAV or MP3)"""
+    return '.wav' if audio_bytes[:4] == b'RIFF' else '.mp3'
+
+
+@functools.lru_cache(maxsize=1)
+def _tts_client():
+    """Process-wide TextToSpeechClient so every composer shares one warm channel"""
+    return texttospeech.TextToSpeechClient()
+
+
+def _decode_frame(scene: dict) -> np.ndarray:
+    """Decode a scene image into an RGB array (asarray avoids a second pixel copy)"""
+    image_bytes = scene.get('image_bytes')
+    raw_size = _raw_frame_size(scene)
+    if raw_size:
+        # Already RGB24 pixels, wrap without decoding
+        width, height = raw_size
+        return np.frombuffer(image_bytes, dtype=np.uint8).reshape(height, width, 3)
+    
+    img = Image.open(io.BytesIO(image_bytes))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return np.asarray(img)
+
+
+def _audio_duration(audio_bytes: bytes, audio_path: str) -> float:
+    """
+    Duration in seconds of narration audio, read from headers where possible
+    
+    Args:
+        audio_bytes: WAV (or legacy MP3) audio
+        audio_path: Same audio on disk, only decoded if headers can't be parsed
+        
+    Returns:
+        Duration in seconds
+    """
+    if audio_bytes[:4] == b'RIFF':
+        with wave.open(io.BytesIO(audio_bytes), 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    
+    audio_clip = AudioFileClip(audio_path)
+    duration = audio_clip.duration
+    audio_clip.close()
+    return duration
+
+
+def _watermark_filter() -> str:
+    """ffmpeg drawtext filter burning "Vishwas Netra" into the top-right corner"""
+    options = [
+        "text='Vishwas Netra'",
+        "fontsize=32",
+        "fontcolor=white",
+        "borderw=2",
+        "bordercolor=black",
+        "x=w-tw-20",
+        "y=20",
+    ]
+    font = next((f for f in WATERMARK_FONT_CANDIDATES if f and os.path.exists(f)), None)
+    if font:
+        # Filter option values need ':' escaped (Windows drive letters)
+        options.insert(0, "fontfile='" + font.replace('\\', '/').replace(':', '\\:') + "'")
+    return 'drawtext=' + ':'.join(options)
+
+
 class VideoComposerAgent:
     """Agent that composes video reels with synced images and TTS audio"""
     
@@ -33,11 +163,24 @@ class VideoComposerAgent:
             project_id: Google Cloud project ID
         """
         self.project_id = project_id
+        self.max_tts_workers = 8  # Concurrent TTS requests per video
+        
+        # Streaming synthesis needs a Chirp 3 HD voice; it returns raw 24 kHz 16-bit mono PCM
+        self.streaming_voice_name = "en-US-Chirp3-HD-Charon"
+        self.streaming_sample_rate = 24000
+        
+        # Synthesized audio cache: in-memory LRU backed by files on disk
+        self.tts_cache_dir = Path(__file__).parent.parent / "cache" / "tts"
+        self.tts_cache_size = 256
+        self.tts_disk_cache_files = 1024
+        self._tts_cache = OrderedDict()
+        self._tts_cache_lock = threading.Lock()
+        self._tts_disk_lock = threading.Lock()
         
         # Initialize Text-to-Speech client
         if TTS_AVAILABLE:
             try:
-                self.tts_client = texttospeech.TextToSpeechClient()
+                self.tts_client = _tts_client()
                 logger.info("🎙️ Video Composer initialized with Google TTS")
             except Exception as e:
                 logger.warning(f"⚠️ TTS client initialization failed: {e}")
@@ -45,6 +188,12 @@ class VideoComposerAgent:
         else:
             logger.warning("⚠️ Google Cloud TTS not available - using silent audio")
             self.tts_client = None
+        
+        # Chirp 3 HD streaming is opt-in: the voice has to be enabled for the project
+        self.streaming_tts = (
+            self.tts_client is not None
+            and os.getenv('TTS_STREAMING', 'false').lower() in ('1', 'true', 'yes')
+        )
     
     def generate_audio(self, text: str, scene_number: int) -> bytes:
         """
@@ -55,13 +204,16 @@ class VideoComposerAgent:
             scene_number: Scene number for logging
             
         Returns:
-            Audio bytes (MP3 format)
+            WAV audio bytes
         """
         if not self.tts_client:
             logger.error(f"❌ TTS client not available for scene {scene_number}")
             return self._generate_silent_audio(3)
         
-        logger.info(f"🎙️ Generating audio for scene {scene_number}: {text[:50]}...")
+        if self.streaming_tts:
+            audio_bytes = self._generate_audio_streaming(text, scene_number)
+            if audio_bytes is not None:
+                return audio_bytes
         
         try:
             # Set up the text input
@@ -74,13 +226,25 @@ class VideoComposerAgent:
                 ssml_gender=texttospeech.SsmlVoiceGender.MALE
             )
             
-            # Configure audio format
+            # Configure audio format (LINEAR16 comes back as WAV, no MP3 decode later)
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+                sample_rate_hertz=24000,
                 speaking_rate=1.0,
                 pitch=0.0
             )
             
+            cache_key = hashlib.sha1(
+                f"{text}|{voice.name}|LINEAR16|{audio_config.sample_rate_hertz}|"
+                f"{audio_config.speaking_rate}|{audio_config.pitch}".encode()
+            ).hexdigest()
+            cached = self._get_cached_audio(cache_key, '.wav')
+            if cached is not None:
+                logger.info(f"♻️ Reusing cached audio for scene {scene_number}")
+                return cached
+            
+            logger.info(f"🎙️ Generating audio for scene {scene_number}: {text[:50]}...")
+            
             # Generate speech
             response = self.tts_client.synthesize_speech(
                 input=synthesis_input,
@@ -89,12 +253,120 @@ class VideoComposerAgent:
             )
             
             logger.info(f"✅ Audio generated for scene {scene_number} ({len(response.audio_content)} bytes)")
+            self._store_cached_audio(cache_key, '.wav', response.audio_content)
             return response.audio_content
             
         except Exception as e:
             logger.error(f"❌ Error generating audio for scene {scene_number}: {e}")
             return self._generate_silent_audio(3)
     
+    def _generate_audio_streaming(self, text: str, scene_number: int) -> bytes:
+        """Generate audio with streaming synthesis and return it as WAV bytes, or None on failure"""
+        cache_key = hashlib.sha1(
+            f"{text}|{self.streaming_voice_name}|{self.streaming_sample_rate}".encode()
+        ).hexdigest()
+        cached = self._get_cached_audio(cache_key, '.wav')
+        if cached is not None:
+            logger.info(f"♻️ Reusing cached audio for scene {scene_number}")
+            return cached
+        
+        logger.info(f"🎙️ Streaming audio for scene {scene_number}: {text[:50]}...")
+        
+        try:
+            streaming_config = texttospeech.StreamingSynthesizeConfig(
+                voice=texttospeech.VoiceSelectionParams(
+                    language_code="en-US",
+                    name=self.streaming_voice_name
+                )
+            )
+            requests = iter([
+                texttospeech.StreamingSynthesizeRequest(streaming_config=streaming_config),
+                texttospeech.StreamingSynthesizeRequest(
+                    input=texttospeech.StreamingSynthesisInput(text=text)
+                ),
+            ])
+            
+            pcm = bytearray()
+            for response in self.tts_client.streaming_synthesize(requests=requests):
+                pcm += response.audio_content
+            
+            # Wrap the raw PCM in a WAV header so ffmpeg can read it
+            buffer = io.BytesIO()
+            with wave.open(buffer, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.streaming_sample_rate)
+                wav.writeframes(pcm)
+            audio_bytes = buffer.getvalue()
+            
+            logger.info(f"✅ Audio streamed for scene {scene_number} ({len(audio_bytes)} bytes)")
+            self._store_cached_audio(cache_key, '.wav', audio_bytes)
+            return audio_bytes
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Streaming TTS failed for scene {scene_number}, using standard synthesis: {e}")
+            return None
+    
+    def _get_cached_audio(self, key: str, suffix: str) -> bytes:
+        """Look up synthesized audio in memory, then on disk"""
+        with self._tts_cache_lock:
+            audio = self._tts_cache.get(key)
+            if audio is not None:
+                self._tts_cache.move_to_end(key)
+                return audio
+        
+        path = self.tts_cache_dir / f"{key}{suffix}"
+        try:
+            audio = path.read_bytes()
+        except OSError:
+            return None
+        
+        # Refresh the mtime so disk eviction drops the least recently used files
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        self._remember_audio(key, audio)
+        return audio
+    
+    def _store_cached_audio(self, key: str, suffix: str, audio: bytes):
+        """Save synthesized audio in memory and on disk"""
+        self._remember_audio(key, audio)
+        try:
+            self.tts_cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.tts_cache_dir / f"{key}{suffix}").write_bytes(audio)
+            self._prune_disk_cache()
+        except OSError as e:
+            logger.warning(f"⚠️ Could not persist TTS audio: {e}")
+    
+    def _prune_disk_cache(self):
+        """Delete the oldest cached audio files beyond tts_disk_cache_files"""
+        with self._tts_disk_lock:
+            files = []
+            for path in self.tts_cache_dir.iterdir():
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+            
+            if len(files) <= self.tts_disk_cache_files:
+                return
+            
+            files.sort()
+            for _, path in files[:len(files) - self.tts_disk_cache_files]:
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+    
+    def _remember_audio(self, key: str, audio: bytes):
+        with self._tts_cache_lock:
+            self._tts_cache[key] = audio
+            self._tts_cache.move_to_end(key)
+            if len(self._tts_cache) > self.tts_cache_size:
+                self._tts_cache.popitem(last=False)
+    
     def compose_video(self, scenes: list, output_path: str = None) -> str:
         """
         Compose final video with synced images and audio
@@ -113,111 +385,192 @@ class VideoComposerAgent:
             output_path = os.path.join(temp_dir, f"reel_{os.urandom(8).hex()}.mp4")
         
         try:
-            video_clips = []
-            audio_clips = []
-            current_time = 0
+            # Pass 1: synthesize narration for all scenes concurrently (network-bound)
+            logger.info("🎙️ Generating narration audio for all scenes...")
+            with ThreadPoolExecutor(max_workers=max(1, min(len(scenes), self.max_tts_workers))) as executor:
+                scene_audio = list(executor.map(
+                    lambda scene: self.generate_audio(scene.get('narration', ''), scene.get('scene_number', 1)),
+                    scenes
+                ))
+            
+            # Pass 2: assemble and encode the video
+            try:
+                self._compose_with_ffmpeg(scenes, scene_audio, output_path)
+            except (subprocess.CalledProcessError, OSError) as e:
+                stderr = getattr(e, 'stderr', b'') or b''
+                logger.warning(f"⚠️ ffmpeg pipeline failed ({e}): {stderr.decode(errors='replace')[-500:]}")
+                logger.info("↩️ Falling back to MoviePy composition")
+                self._compose_with_moviepy(scenes, scene_audio, output_path)
             
-            for scene in scenes:
-                scene_number = scene.get('scene_number', 1)
+            logger.info(f"✅ Video composed successfully: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"❌ Error composing video: {type(e).__name__}: {e}")
+            raise
+    
+    def _compose_with_ffmpeg(self, scenes: list, scene_audio: list, output_path: str):
+        """
+        Build the reel with a single ffmpeg invocation
+        
+        Each still image is looped for its scene duration, its narration is
+        padded to the same length, and ffmpeg's concat filter joins the
+        scenes before one libx264/AAC encode - no Python frame loop.
+        """
+        with tempfile.TemporaryDirectory(prefix='reel_') as work_dir:
+            inputs = []
+            audio_inputs = []
+            durations = []
+            
+            for i, (scene, audio_bytes) in enumerate(zip(scenes, scene_audio)):
                 image_bytes = scene.get('image_bytes')
-                narration = scene.get('narration', '')
-                duration = scene.get('duration', 4)
-                
-                logger.info(f"🎞️ Processing scene {scene_number}...")
-                
-                # Save image to temporary file
-                img = Image.open(io.BytesIO(image_bytes))
-                img_array = np.array(img)
+                raw_size = _raw_frame_size(scene)
+                suffix = '.rgb' if raw_size else _image_suffix(image_bytes)
+                image_path = os.path.join(work_dir, f"scene_{i}{suffix}")
+                with open(image_path, 'wb') as f:
+                    f.write(image_bytes)
                 
-                # Generate audio for this scene
-                audio_bytes = self.generate_audio(narration, scene_number)
-                
-                # Save audio to temporary file
-                temp_audio_path = os.path.join(tempfile.gettempdir(), f"audio_{scene_number}.mp3")
-                with open(temp_audio_path, 'wb') as f:
+                audio_path = os.path.join(work_dir, f"audio_{i}{_audio_suffix(audio_bytes)}")
+                with open(audio_path, 'wb') as f:
                     f.write(audio_bytes)
                 
-                # Load audio to get its actual duration
-                audio_clip = AudioFileClip(temp_audio_path)
-                actual_duration = max(audio_clip.duration, duration)
+                # Show each image for at least as long as its narration
+                duration = max(_audio_duration(audio_bytes, audio_path), scene.get('duration', 4))
+                durations.append(duration)
                 
-                # Create image clip with the duration of audio
-                image_clip = ImageClip(img_array, duration=actual_duration)
+                if raw_size:
+                    # Raw RGB24 frame: loop the single frame through the rawvideo demuxer
+                    inputs += [
+                        '-f', 'rawvideo', '-pixel_format', 'rgb24',
+                        '-video_size', f"{raw_size[0]}x{raw_size[1]}",
+                        '-framerate', '24', '-stream_loop', '-1'
+                    ]
+                else:
+                    inputs += ['-loop', '1', '-framerate', '24']
+                inputs += ['-t', f"{duration:.3f}", '-i', image_path]
+                audio_inputs += ['-i', audio_path]
+            
+            n = len(durations)
+            filters = []
+            for i, duration in enumerate(durations):
+                filters.append(
+                    f"[{i}:v]scale=1080:1920:force_original_aspect_ratio=decrease,"
+                    f"pad=1080:1920:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p[v{i}]"
+                )
+                filters.append(
+                    f"[{n + i}:a]aformat=sample_rates=44100:channel_layouts=stereo,"
+                    f"apad=whole_dur={duration:.3f}[a{i}]"
+                )
+            pairs = ''.join(f"[v{i}][a{i}]" for i in range(n))
+            filters.append(f"{pairs}concat=n={n}:v=1:a=1[vc][aout]")
+            filters.append(f"[vc]{_watermark_filter()}[vout]")
+            
+            cmd = [
+                FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+                *inputs, *audio_inputs,
+                '-filter_complex', ';'.join(filters),
+                '-map', '[vout]', '-map', '[aout]',
+                '-r', '24',
+                '-c:v', 'libx264', *X264_PARAMS,
+                '-threads', '0',
+                '-c:a', 'aac',
+                '-shortest',
+                output_path
+            ]
+            
+            logger.info(f"💾 Encoding {n} scenes with ffmpeg to {output_path}...")
+            subprocess.run(cmd, check=True, capture_output=True)
+    
+    def _compose_with_moviepy(self, scenes: list, scene_audio: list, output_path: str):
+        """Build the reel frame by frame with MoviePy (fallback path)"""
+        video_clips = []
+        audio_clips = []
+        current_time = 0
+        
+        # Decode all scene images up front in parallel (Pillow releases the GIL)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(scenes), os.cpu_count() or 1))) as executor:
+            frames = list(executor.map(_decode_frame, scenes))
+        
+        # One private working directory per composition, removed in bulk at the end.
+        # Audio files must outlive the clips since MoviePy reads them lazily.
+        with tempfile.TemporaryDirectory(prefix='reel_') as work_dir:
+            try:
+                for scene, audio_bytes, img_array in zip(scenes, scene_audio, frames):
+                    scene_number = scene.get('scene_number', 1)
+                    duration = scene.get('duration', 4)
+                    
+                    logger.info(f"🎞️ Processing scene {scene_number}...")
+                    
+                    # Save audio to temporary file
+                    temp_audio_path = os.path.join(work_dir, f"{uuid.uuid4().hex}{_audio_suffix(audio_bytes)}")
+                    with open(temp_audio_path, 'wb') as f:
+                        f.write(audio_bytes)
+                    
+                    # Load audio to get its actual duration
+                    audio_clip = AudioFileClip(temp_audio_path)
+                    actual_duration = max(audio_clip.duration, duration)
+                    
+                    # Create image clip with the duration of audio
+                    image_clip = ImageClip(img_array, duration=actual_duration)
+                    
+                    # Set audio start time
+                    audio_clip = audio_clip.set_start(current_time)
+                    
+                    video_clips.append(image_clip)
+                    audio_clips.append(audio_clip)
+                    
+                    current_time += actual_duration
                 
-                # Set audio start time
-                audio_clip = audio_clip.set_start(current_time)
+                # Concatenate all video clips
+                logger.info("🔗 Concatenating video clips...")
+                final_video = concatenate_videoclips(video_clips, method="compose")
                 
-                video_clips.append(image_clip)
-                audio_clips.append(audio_clip)
+                # Combine all audio clips
+                logger.info("🔊 Composing audio track...")
+                final_audio = CompositeAudioClip(audio_clips)
                 
-                current_time += actual_duration
+                # Set audio to video
+                final_video = final_video.set_audio(final_audio)
                 
-                # Clean up temp audio file
+                # Write final video, burning the watermark in during the encode
+                logger.info(f"💾 Writing video to {output_path}...")
+                temp_audiofile = os.path.join(work_dir, 'temp-audio.m4a')
                 try:
-                    os.remove(temp_audio_path)
-                except:
-                    pass
-            
-            # Concatenate all video clips
-            logger.info("🔗 Concatenating video clips...")
-            final_video = concatenate_videoclips(video_clips, method="compose")
-            
-            # Add "Vishwas Netra" watermark
-            logger.info("🏷️ Adding Vishwas Netra watermark...")
-            try:
-                watermark = TextClip(
-                    "Vishwas Netra",
-                    fontsize=32,
-                    color='white',
-                    font='Arial-Bold',
-                    stroke_color='black',
-                    stroke_width=2
-                ).set_position(('right', 'top')).set_duration(final_video.duration).margin(right=20, top=20, opacity=0)
+                    self._write_moviepy_video(final_video, output_path, temp_audiofile, ['-vf', _watermark_filter()])
+                except (IOError, OSError) as e:
+                    logger.warning(f"⚠️ Could not add watermark (font may be missing): {e}")
+                    # Continue without watermark if drawtext fails
+                    self._write_moviepy_video(final_video, output_path, temp_audiofile, [])
                 
-                final_video = CompositeVideoClip([final_video, watermark])
-            except Exception as e:
-                logger.warning(f"⚠️ Could not add watermark (font may be missing): {e}")
-                # Continue without watermark if TextClip fails
-            
-            # Combine all audio clips
-            logger.info("🔊 Composing audio track...")
-            final_audio = CompositeAudioClip(audio_clips)
-            
-            # Set audio to video
-            final_video = final_video.set_audio(final_audio)
-            
-            # Write final video
-            logger.info(f"💾 Writing video to {output_path}...")
-            final_video.write_videofile(
-                output_path,
-                fps=24,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile=os.path.join(tempfile.gettempdir(), 'temp-audio.m4a'),
-                remove_temp=True,
-                logger=None  # Suppress moviepy's verbose logging
-            )
-            
-            # Clean up
-            final_video.close()
-            for clip in video_clips:
-                clip.close()
-            for clip in audio_clips:
-                clip.close()
-            
-            logger.info(f"✅ Video composed successfully: {output_path}")
-            return output_path
-            
-        except Exception as e:
-            logger.error(f"❌ Error composing video: {type(e).__name__}: {e}")
-            raise
+                final_video.close()
+            finally:
+                # Clean up (release file handles before the directory is removed)
+                for clip in video_clips:
+                    clip.close()
+                for clip in audio_clips:
+                    clip.close()
+    
+    def _write_moviepy_video(self, final_video, output_path: str, temp_audiofile: str, extra_params: list):
+        """Encode a MoviePy clip with the shared x264 settings"""
+        final_video.write_videofile(
+            output_path,
+            fps=24,
+            codec='libx264',
+            preset='veryfast',
+            ffmpeg_params=X264_PARAMS[2:] + extra_params,
+            threads=os.cpu_count(),
+            audio_codec='aac',
+            temp_audiofile=temp_audiofile,
+            remove_temp=True,
+            logger=None  # Suppress moviepy's verbose logging
+        )
     
     def _generate_silent_audio(self, duration: float) -> bytes:
-        """Generate silent audio of specified duration"""
-        import io
-        from pydub import AudioSegment
-        
-        silent = AudioSegment.silent(duration=int(duration * 1000))
+        """Generate silent WAV audio of specified duration"""
         buffer = io.BytesIO()
-        silent.export(buffer, format="mp3")
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.streaming_sample_rate)
+            wav.writeframes(b'\x00\x00' * int(duration * self.streaming_sample_rate))
         return buffer.getvalue()
@@ -2,27 +2,60 @@
 Google Cloud Storage handler for video uploads (Standalone version)
 """
 
+import functools
 import os
 import logging
 from datetime import timedelta
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.api_core import exceptions
 
 logger = logging.getLogger(__name__)
 
+# Resumable upload chunk size (must be a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Files larger than this are uploaded as parallel chunks
+PARALLEL_UPLOAD_THRESHOLD = 32 * 1024 * 1024
+
+# Rendered reels never change once uploaded, let caches keep them
+VIDEO_CACHE_CONTROL = 'public, max-age=86400'
+
+# Signed URLs last 24 hours
+SIGNED_URL_EXPIRY = timedelta(hours=24)
+
+
+@functools.lru_cache(maxsize=1)
+def _storage_client() -> storage.Client:
+    """Process-wide storage client so every handler shares one connection pool"""
+    return storage.Client()
+
 
 class GCSStorage:
     """Handler for Google Cloud Storage operations"""
     
-    def __init__(self, bucket_name: str):
-        """Initialize GCS client"""
+    def __init__(self, bucket_name: str, public_read: bool = None, strict: bool = False):
+        """
+        Initialize GCS client
+        
+        Args:
+            bucket_name: Name of the bucket holding the reels
+            public_read: Whether the bucket allows public reads, in which case
+                plain public URLs are returned instead of signed ones
+                (defaults to the GCS_PUBLIC_READ environment variable)
+            strict: Verify the bucket exists now instead of on first use
+        """
         try:
-            self.client = storage.Client()
+            self.client = _storage_client()
             self.bucket_name = bucket_name
             self.bucket = self.client.bucket(self.bucket_name)
             
-            # Verify bucket exists
-            if not self.bucket.exists():
+            if public_read is None:
+                public_read = os.getenv('GCS_PUBLIC_READ', 'false').lower() in ('1', 'true', 'yes')
+            self.public_read = public_read
+            
+            # Verify bucket exists (otherwise the first upload surfaces it)
+            if strict and not self.bucket.exists():
                 logger.error(f"Bucket {self.bucket_name} does not exist!")
                 raise ValueError(f"Bucket {self.bucket_name} not found")
             
@@ -47,13 +80,13 @@ class GCSStorage:
             content_type: MIME type of the video
             
         Returns:
-            Signed URL for the uploaded video
+            URL for the uploaded video (public or signed)
         """
         try:
             logger.info(f"Uploading video to GCS: {filename}")
             
             # Create blob
-            blob = self.bucket.blob(filename)
+            blob = self._video_blob(filename, content_type)
             
             # Upload video
             blob.upload_from_string(
@@ -62,17 +95,62 @@ class GCSStorage:
             )
             
             logger.info(f"Video uploaded successfully: {filename}")
+            return self._video_url(blob)
             
-            # Generate signed URL (24 hour expiry)
-            url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(hours=24),
-                method="GET"
-            )
+        except exceptions.NotFound as e:
+            logger.error(f"Bucket {self.bucket_name} does not exist! ({e})")
+            raise
+        except exceptions.Forbidden as e:
+            logger.error(f"Permission denied uploading to GCS: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error uploading video to GCS: {e}")
+            raise
+    
+    def upload_video_file(
+        self,
+        video_path: str,
+        filename: str,
+        content_type: str = 'video/mp4'
+    ) -> str:
+        """
+        Upload a video file from disk to Google Cloud Storage
+        
+        Large files are split into chunks uploaded concurrently and
+        reassembled server-side; smaller ones use a resumable upload.
+        
+        Args:
+            video_path: Local path of the video file
+            filename: Destination filename in GCS (e.g., 'reels/video_123.mp4')
+            content_type: MIME type of the video
+            
+        Returns:
+            URL for the uploaded video (public or signed)
+        """
+        try:
+            size = os.path.getsize(video_path)
+            logger.info(f"Uploading video to GCS: {filename} ({size} bytes)")
+            
+            blob = self._video_blob(filename, content_type)
             
-            logger.info("Video uploaded successfully with signed URL (expires in 24 hours)")
-            return url
+            if size > PARALLEL_UPLOAD_THRESHOLD:
+                transfer_manager.upload_chunks_concurrently(
+                    video_path,
+                    blob,
+                    content_type=content_type,
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                    worker_type=transfer_manager.THREAD,
+                    max_workers=8
+                )
+            else:
+                blob.upload_from_filename(video_path, content_type=content_type)
             
+            logger.info(f"Video uploaded successfully: {filename}")
+            return self._video_url(blob)
+            
+        except exceptions.NotFound as e:
+            logger.error(f"Bucket {self.bucket_name} does not exist! ({e})")
+            raise
         except exceptions.Forbidden as e:
             logger.error(f"Permission denied uploading to GCS: {e}")
             raise
@@ -80,6 +158,33 @@ class GCSStorage:
             logger.error(f"Error uploading video to GCS: {e}")
             raise
     
+    def _video_blob(self, filename: str, content_type: str) -> storage.Blob:
+        """Create a blob with upload chunking and cache headers preset"""
+        blob = self.bucket.blob(filename, chunk_size=UPLOAD_CHUNK_SIZE)
+        blob.content_type = content_type
+        blob.cache_control = VIDEO_CACHE_CONTROL
+        return blob
+    
+    def _video_url(self, blob: storage.Blob) -> str:
+        """
+        URL for an uploaded blob
+        
+        Public buckets get the plain public URL with no signing. Otherwise a
+        V4 signed URL (24 hour expiry) is generated.
+        """
+        if self.public_read:
+            logger.info("Video uploaded successfully with public URL")
+            return blob.public_url
+        
+        url = blob.generate_signed_url(
+            version="v4",
+            expiration=SIGNED_URL_EXPIRY,
+            method="GET"
+        )
+        
+        logger.info("Video uploaded successfully with signed URL (expires in 24 hours)")
+        return url
+    
     def download_video(self, filename: str) -> bytes:
         """
         Download video from Google Cloud Storage
@@ -137,7 +242,12 @@ class GCSStorage:
             List of blob names
         """
         try:
-            blobs = self.bucket.list_blobs(prefix=prefix)
+            # Only names are needed; project the listing down to them
+            blobs = self.client.list_blobs(
+                self.bucket,
+                prefix=prefix,
+                fields='items(name),nextPageToken'
+            )
             video_list = [blob.name for blob in blobs]
             
             logger.info(f"Found {len(video_list)} videos with prefix '{prefix}'")
@@ -0,0 +1,40 @@
+"""
+Thread-safe token bucket for client-side API rate limiting
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute`` tokens per minute"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate_per_minute: Sustained number of tokens granted per minute
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until ``tokens`` are available, then consume them"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
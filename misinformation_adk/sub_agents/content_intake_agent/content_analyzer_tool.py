@@ -1,7 +1,10 @@
 from google.adk.tools.base_tool import BaseTool
 import mimetypes
 import os
-import base64
+import re
+
+# Base64 alphabet with optional trailing padding
+BASE64_PATTERN = re.compile(r'[A-Za-z0-9+/]+={0,2}')
 
 class ContentAnalyzerTool(BaseTool):
     def __init__(self):
@@ -79,10 +82,6 @@ class ContentAnalyzerTool(BaseTool):
     
     def _is_base64(self, s: str) -> bool:
         """Check if string is base64 encoded."""
-        try:
-            if len(s) < 100:  # Too short to be base64 media
-                return False
-            base64.b64decode(s[:100])
-            return True
-        except:
+        if len(s) < 100:  # Too short to be base64 media
             return False
+        return BASE64_PATTERN.fullmatch(s[:100]) is not None
@@ -1,24 +1,159 @@
 from google.adk.tools.base_tool import BaseTool
+import atexit
 import json
 import os
+import queue
+import sqlite3
+import threading
 from datetime import datetime
 import hashlib
 
+# Connections shared by every tool instance, keyed by database path
+_DATABASES = {}
+_DATABASES_LOCK = threading.Lock()
+
+CLAIM_UPSERT_SQL = """
+    INSERT INTO claims VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        claim = excluded.claim,
+        verdict = excluded.verdict,
+        confidence = excluded.confidence,
+        evidence = excluded.evidence,
+        last_checked = excluded.last_checked,
+        check_count = claims.check_count + 1,
+        status = excluded.status
+"""
+
+
+class _ClaimWriter:
+    """Background thread that commits queued claim writes in batches."""
+    
+    BATCH_SIZE = 256
+    
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="claim-db-writer", daemon=True).start()
+        atexit.register(self.flush)
+    
+    def put(self, record: tuple):
+        """Queue a claim row (same column order as the claims table)."""
+        self._queue.put(record)
+    
+    def flush(self):
+        """Block until every queued write has been committed."""
+        self._queue.join()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write(batch)
+            except Exception as e:
+                print(f"[ERROR] Failed to write {len(batch)} claims: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write(self, batch: list):
+        # The last write of a claim in the batch decides its pending state
+        latest = {record[0]: record for record in batch}
+        pending = [(r[0], r[1], r[6]) for r in latest.values() if r[8] == "pending"]
+        resolved = [(r[0],) for r in latest.values() if r[8] != "pending"]
+        
+        with self._lock, self._conn:
+            self._conn.executemany(CLAIM_UPSERT_SQL, [r[:7] + (r[8],) for r in batch])
+            self._conn.executemany("INSERT OR IGNORE INTO pending_claims VALUES (?, ?, ?)", pending)
+            self._conn.executemany("DELETE FROM pending_claims WHERE id = ?", resolved)
+
+
 class ClaimDatabaseTool(BaseTool):
     def __init__(self):
         super().__init__(
             name="claim_database",
             description="Stores uncertain claims for periodic re-checking and retrieves previous fact-check results."
         )
-        self.db_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'claims_db.json')
+        data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+        self.db_path = os.path.join(data_dir, 'claims_db.sqlite')
+        self.legacy_db_path = os.path.join(data_dir, 'claims_db.json')
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
-        """Create database file if it doesn't exist."""
+        """Open the shared database connection, creating the schema if needed."""
+        db_key = os.path.abspath(self.db_path)
+        with _DATABASES_LOCK:
+            if db_key not in _DATABASES:
+                self._open_db()
+                _DATABASES[db_key] = (self.conn, self._lock, _ClaimWriter(self.conn, self._lock))
+            self.conn, self._lock, self._writer = _DATABASES[db_key]
+    
+    def _open_db(self):
+        """Create database and schema if they don't exist."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        if not os.path.exists(self.db_path):
-            with open(self.db_path, 'w') as f:
-                json.dump({"claims": [], "pending_claims": []}, f)
+        is_new = not os.path.exists(self.db_path)
+        
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS claims (
+                    id TEXT PRIMARY KEY,
+                    claim TEXT,
+                    verdict TEXT,
+                    confidence REAL,
+                    evidence TEXT,
+                    first_checked TEXT,
+                    last_checked TEXT,
+                    check_count INTEGER,
+                    status TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending_claims (
+                    id TEXT PRIMARY KEY,
+                    claim TEXT,
+                    added TEXT
+                )
+            """)
+        
+        if is_new and os.path.exists(self.legacy_db_path):
+            self._import_legacy_db()
+    
+    def _import_legacy_db(self):
+        """Copy claims from the old JSON database into a freshly created SQLite one."""
+        try:
+            with open(self.legacy_db_path, 'r') as f:
+                db = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] Could not import legacy claims database: {e}")
+            return
+        
+        # Legacy ids were MD5; re-key from the claim text so lookups match
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (self._get_claim_hash(c['claim']), c['claim'], c.get('verdict'), c.get('confidence', 0.0),
+                     json.dumps(c.get('evidence') or {}), c.get('first_checked'),
+                     c.get('last_checked'), c.get('check_count', 1), c.get('status'))
+                    for c in db.get('claims', [])
+                ]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pending_claims VALUES (?, ?, ?)",
+                [(self._get_claim_hash(c['claim']), c['claim'], c.get('added')) for c in db.get('pending_claims', [])]
+            )
     
     def run(self, action: str, claim: str = None, verdict: str = None, 
             confidence: float = 0.0, evidence: dict = None) -> dict:
@@ -52,78 +187,42 @@ class ClaimDatabaseTool(BaseTool):
     
     def _get_claim_hash(self, claim: str) -> str:
         """Generate unique hash for claim."""
-        return hashlib.md5(claim.lower().strip().encode()).hexdigest()
+        return hashlib.blake2b(claim.lower().strip().encode(), digest_size=16).hexdigest()
     
     def _store_claim(self, claim: str, verdict: str, confidence: float, evidence: dict) -> dict:
         """Store a new claim in the database."""
-        with open(self.db_path, 'r') as f:
-            db = json.load(f)
-        
         claim_hash = self._get_claim_hash(claim)
+        now = datetime.now().isoformat()
+        status = "pending" if verdict == "UNCERTAIN" or confidence < 0.6 else "resolved"
         
-        claim_record = {
-            "id": claim_hash,
-            "claim": claim,
-            "verdict": verdict,
-            "confidence": confidence,
-            "evidence": evidence or {},
-            "first_checked": datetime.now().isoformat(),
-            "last_checked": datetime.now().isoformat(),
-            "check_count": 1,
-            "status": "pending" if verdict == "UNCERTAIN" or confidence < 0.6 else "resolved"
-        }
-        
-        # Check if claim already exists
-        existing_idx = None
-        for idx, c in enumerate(db['claims']):
-            if c['id'] == claim_hash:
-                existing_idx = idx
-                break
-        
-        if existing_idx is not None:
-            # Update existing claim
-            claim_record['first_checked'] = db['claims'][existing_idx]['first_checked']
-            claim_record['check_count'] = db['claims'][existing_idx]['check_count'] + 1
-            db['claims'][existing_idx] = claim_record
-        else:
-            # Add new claim
-            db['claims'].append(claim_record)
-        
-        # Add to pending if uncertain
-        if claim_record['status'] == "pending":
-            if claim_hash not in [c['id'] for c in db.get('pending_claims', [])]:
-                db.setdefault('pending_claims', []).append({
-                    "id": claim_hash,
-                    "claim": claim,
-                    "added": datetime.now().isoformat()
-                })
-        else:
-            # Remove from pending if resolved
-            db['pending_claims'] = [c for c in db.get('pending_claims', []) if c['id'] != claim_hash]
-        
-        with open(self.db_path, 'w') as f:
-            json.dump(db, f, indent=2)
+        # Written back in batches; existing claims keep first_checked and bump
+        # check_count, uncertain ones are (re)added to the pending queue
+        self._writer.put((
+            claim_hash, claim, verdict, confidence, json.dumps(evidence or {}),
+            now, now, 1, status
+        ))
         
         return {
             "success": True,
             "claim_id": claim_hash,
-            "status": claim_record['status'],
-            "message": f"Claim stored successfully ({'pending re-check' if claim_record['status'] == 'pending' else 'resolved'})"
+            "status": status,
+            "message": f"Claim stored successfully ({'pending re-check' if status == 'pending' else 'resolved'})"
         }
     
     def _retrieve_claim(self, claim: str) -> dict:
         """Retrieve a claim from the database."""
-        with open(self.db_path, 'r') as f:
-            db = json.load(f)
-        
         claim_hash = self._get_claim_hash(claim)
         
-        for c in db['claims']:
-            if c['id'] == claim_hash:
-                return {
-                    "found": True,
-                    "claim_data": c
-                }
+        self._writer.flush()
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM claims WHERE id = ?", (claim_hash,)).fetchone()
+        if row is not None:
+            claim_data = dict(row)
+            claim_data['evidence'] = json.loads(claim_data['evidence'] or '{}')
+            return {
+                "found": True,
+                "claim_data": claim_data
+            }
         
         return {
             "found": False,
@@ -136,10 +235,10 @@ class ClaimDatabaseTool(BaseTool):
     
     def _get_pending_claims(self) -> dict:
         """Get all pending claims that need re-checking."""
-        with open(self.db_path, 'r') as f:
-            db = json.load(f)
-        
-        pending = db.get('pending_claims', [])
+        self._writer.flush()
+        with self._lock:
+            rows = self.conn.execute("SELECT id, claim, added FROM pending_claims ORDER BY added").fetchall()
+        pending = [dict(row) for row in rows]
         
         return {
             "success": True,
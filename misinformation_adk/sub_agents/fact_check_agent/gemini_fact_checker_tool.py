@@ -1,69 +1,47 @@
 from google.adk.tools.base_tool import BaseTool
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable, DeadlineExceeded
+import asyncio
+import hashlib
+import json
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from datetime import datetime
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
 
-class GeminiFactCheckerTool(BaseTool):
-    def __init__(self):
-        super().__init__(
-            name="gemini_fact_check",
-            description="Uses Google's Gemini AI with web grounding to fact-check claims."
-        )
-        
-        # Use free Gemini API (Vertex AI has deprecated features)
-        api_key = os.getenv('GOOGLE_API_KEY')
-        if api_key:
-            genai.configure(api_key=api_key)
-            # Use Gemini 2.0 Flash Exp (latest experimental model with best reasoning)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            self.use_vertex = False
-            print("[INFO] Using Gemini 2.0 Flash Exp (latest) for advanced fact-checking with superior reasoning")
-        else:
-            self.model = None
-            self.use_vertex = False
-            print("[WARNING] GOOGLE_API_KEY not found in .env file")
-    
-    def run(self, claim: str, context: str = "") -> dict:
-        """
-        Fact-checks a claim using Gemini AI with web grounding.
-        
-        Args:
-            claim: The claim to fact-check
-            context: Additional context about the claim
-            
-        Returns:
-            Dictionary with fact-check results and sources
-        """
-        # Debug mode (set to False for production)
-        DEBUG = False
-        if DEBUG:
-            print(f"[DEBUG] Fact-checking claim: '{claim}'")
-            print(f"[DEBUG] Context: '{context}'")
-            print(f"[DEBUG] Model initialized: {self.model is not None}")
-        
-        try:
-            if not self.model:
-                return {
-                    "error": "Gemini model not configured. Set GOOGLE_API_KEY environment variable.",
-                    "verdict": "UNCERTAIN",
-                    "confidence": 0.0,
-                    "temporal_status": "UNCLEAR",
-                    "explanation": "",
-                    "key_evidence": [],
-                    "sources": [],
-                    "warnings": []
-                }
-            
-            # Construct comprehensive fact-checking prompt with temporal verification
-            from datetime import datetime
-            current_date = datetime.now().strftime("%B %d, %Y")
-            
-            prompt = f"""You are an expert fact-checker with real-time web access and advanced temporal verification capabilities (similar to X/Twitter's Grok). 
+# Debug mode (set to False for production)
+DEBUG = False
+
+GENERATION_CONFIG = {
+    "temperature": 0.1,
+    "top_p": 0.8,
+    "top_k": 40,
+}
+
+# Single-claim fact-checking prompt ({claim}, {context_block}, {current_date})
+PROMPT_TEMPLATE = """You are an expert fact-checker with real-time web access and advanced temporal verification capabilities (similar to X/Twitter's Grok). 
 
 **IMPORTANT: You have been provided with REAL-TIME web search results from {current_date}. Analyze them carefully.**
 
 CLAIM: {claim}
 
-{f"CONTEXT: {context}" if context else ""}
+{context_block}
 
 Perform comprehensive REAL-TIME verification using the web search results provided above:
 
@@ -84,7 +62,7 @@ Before analyzing, perform two checks:
    - **Temporal Manipulation**: Old news presented as current, out-of-context historical events
    - **Source Credibility**: Claims from unknown sources, missing attribution, "someone said" vagueness
    
-   If pattern detected, note it in MISINFORMATION_PATTERN field with PATTERN_CONFIDENCE (0.0-1.0)
+   If pattern detected, note it in the misinformation_pattern field with pattern_confidence (0.0-1.0)
 
 3. **NO DATA ANALYSIS - ABSENCE OF EVIDENCE**:
    Apply advanced logic for evaluating claims with limited/no data:
@@ -156,161 +134,822 @@ Before analyzing, perform two checks:
      → VERDICT: UNCERTAIN (confidence 0.3-0.4)
      → Note: "Search returned irrelevant results. This suggests the claim may not correspond to any real event."
 
-Provide your analysis in this format:
-
-VERDICT: [TRUE, FALSE, LIKELY_FALSE, PARTIALLY_TRUE, OUTDATED_INFO, UNVERIFIED, or UNCERTAIN]
-CLAIM_SIGNIFICANCE: [MAJOR or MINOR] (Is this a significant event that would generate widespread coverage?)
-CONFIDENCE: [0.0-1.0]
-RELEVANCE_SCORE: [0.0-1.0] (How relevant were the search results to the claim?)
-MISINFORMATION_PATTERN: [Pattern name if detected, or "NONE"]
-PATTERN_CONFIDENCE: [0.0-1.0] (How confident are you this matches a known misinformation pattern?)
-WEIGHTED_SCORE: [Calculated score: (CONFIDENCE * 0.6) + (PATTERN_CONFIDENCE * 0.4) if pattern detected]
-TEMPORAL_STATUS: [CURRENT, OUTDATED, TIMELESS, or UNCLEAR]
-TIME_VERIFICATION: [Details about when events actually occurred - MUST reference current date: {current_date}]
-EXPLANATION: [Detailed reasoning with timeline verification and CURRENT web search results from {current_date}]
-KEY_EVIDENCE:
-- [evidence 1 with date - preferably from 2024-2025]
-- [evidence 2 with date - preferably from 2024-2025]
-SOURCES:
-- [source 1 with publication date - preferably recent]
-- [source 2 with publication date - preferably recent]
-SOCIAL_MEDIA_CONSENSUS: [What Reddit communities and Twitter users are saying NOW in November 2025]
-WARNINGS: [Any red flags like outdated info, missing context, etc.]
+Return a JSON object matching the provided schema:
+
+- verdict: TRUE, FALSE, LIKELY_FALSE, PARTIALLY_TRUE, OUTDATED_INFO, UNVERIFIED, or UNCERTAIN
+- claim_significance: MAJOR or MINOR (Is this a significant event that would generate widespread coverage?)
+- confidence: 0.0-1.0
+- relevance_score: 0.0-1.0 (How relevant were the search results to the claim?)
+- misinformation_pattern: Pattern name if detected, or "NONE"
+- pattern_confidence: 0.0-1.0 (How confident are you this matches a known misinformation pattern?)
+- weighted_score: (confidence * 0.6) + (pattern_confidence * 0.4) if pattern detected, otherwise confidence
+- temporal_status: CURRENT, OUTDATED, TIMELESS, or UNCLEAR
+- time_verification: Details about when events actually occurred - MUST reference current date: {current_date}
+- explanation: Detailed reasoning with timeline verification and CURRENT web search results from {current_date}
+- key_evidence: Evidence items, each with its date - preferably recent
+- sources: Sources, each with its publication date - preferably recent
+- social_media_consensus: What Reddit communities and Twitter users are saying as of {current_date}
+- warnings: Any red flags like outdated info, missing context, etc.
 """
+
+_STRING = {"type": "STRING"}
+_NUMBER = {"type": "NUMBER"}
+_STRING_LIST = {"type": "ARRAY", "items": _STRING}
+
+FACT_CHECK_PROPERTIES = {
+    "verdict": _STRING,
+    "claim_significance": _STRING,
+    "confidence": _NUMBER,
+    "relevance_score": _NUMBER,
+    "misinformation_pattern": _STRING,
+    "pattern_confidence": _NUMBER,
+    "weighted_score": _NUMBER,
+    "temporal_status": _STRING,
+    "time_verification": _STRING,
+    "explanation": _STRING,
+    "key_evidence": _STRING_LIST,
+    "sources": _STRING_LIST,
+    "social_media_consensus": _STRING,
+    "warnings": _STRING_LIST,
+}
+
+# Structured output for run/arun: one verdict object for the claim
+FACT_CHECK_SCHEMA = {
+    "type": "OBJECT",
+    "properties": FACT_CHECK_PROPERTIES,
+    "required": ["verdict", "confidence", "explanation"],
+}
+
+# Structured output for run_batch: one verdict object per numbered claim
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"index": {"type": "INTEGER"}, **FACT_CHECK_PROPERTIES},
+        "required": ["index", "verdict", "confidence", "explanation"],
+    },
+}
+
+JSON_GENERATION_CONFIG = {
+    **GENERATION_CONFIG,
+    "response_mime_type": "application/json",
+    "response_schema": FACT_CHECK_SCHEMA,
+}
+
+# Retry policy for quota (429) and transient server errors
+RETRYABLE_ERRORS = (ResourceExhausted, ServiceUnavailable, DeadlineExceeded)
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 10  # seconds
+RETRY_MAX_DELAY = 120  # seconds
+
+# How long a request waits for the background warm-up call to finish
+WARMUP_WAIT = 0.1  # seconds
+
+# Claims that never reach Gemini: too short to check, or just a link
+MIN_CLAIM_LENGTH = 8
+URL_ONLY_PATTERN = re.compile(r"https?://\S+")
+
+# Markers that post-processing already added (or the model already said)
+IRRELEVANT_PATTERN = re.compile(r"irrelevant", re.I)
+ABSENCE_PATTERN = re.compile(r"absence of credible sources", re.I)
+
+# Fact-check results shared by every tool instance, keyed by (claim, context)
+RESULT_CACHE_SIZE = 4096
+RESULT_CACHE_TTL = 3600  # seconds
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# Results persisted across restarts behind the in-memory cache, kept for
+# longer when the verdict is settled
+DISK_CACHE_TTL = {
+    "TRUE": 7 * 86400,
+    "FALSE": 30 * 86400,
+    "LIKELY_FALSE": 7 * 86400,
+    "OUTDATED_INFO": 7 * 86400,
+    "UNCERTAIN": 3600,
+}
+DISK_CACHE_DEFAULT_TTL = 86400  # seconds
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, with orjson when installed."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to a JSON string, with orjson when installed."""
+    return orjson.dumps(obj).decode() if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+class _ResultStore:
+    """SQLite table of fact-check results, opened on first use."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS fact_checks (
+                        key BLOB PRIMARY KEY,
+                        verdict TEXT,
+                        stored_at REAL,
+                        result TEXT
+                    )
+                """)
+        return self._conn
+    
+    def get(self, key: bytes) -> dict:
+        """Return a stored result that is still fresh for its verdict, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT verdict, stored_at, result FROM fact_checks WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        verdict, stored_at, result = row
+        if time.time() - stored_at > DISK_CACHE_TTL.get(verdict, DISK_CACHE_DEFAULT_TTL):
+            return None
+        return _json_loads(result)
+    
+    def put(self, key: bytes, result: dict):
+        """Store a result, replacing any older one for the same key."""
+        record = _json_dumps(result)
+        with self._lock, self._connection():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fact_checks VALUES (?, ?, ?, ?)",
+                (key, result.get("verdict"), time.time(), record)
+            )
+
+
+_result_store = _ResultStore(os.getenv(
+    "FC_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'fact_check_cache.sqlite')
+))
+
+# Claims this similar (cosine) to a curated hoax are answered locally
+HOAX_SIMILARITY_THRESHOLD = 0.85
+HOAX_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class _HoaxIndex:
+    """
+    Curated hoax embeddings (hoax_embeds.npy, one row per hoax, built with
+    HOAX_EMBEDDING_MODEL) and their pattern labels (hoax_labels.json).
+    
+    Loaded on first use; inactive if either file or sentence-transformers
+    is missing.
+    """
+    
+    def __init__(self, data_dir: str):
+        self.embeds_path = os.path.join(data_dir, 'hoax_embeds.npy')
+        self.labels_path = os.path.join(data_dir, 'hoax_labels.json')
+        self._loaded = False
+        self._encoder = None
+        self._embeds = None
+        self._labels = []
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not (SENTENCE_TRANSFORMERS_AVAILABLE
+                    and os.path.exists(self.embeds_path) and os.path.exists(self.labels_path)):
+                return
+            try:
+                embeds = np.load(self.embeds_path).astype(np.float32)
+                with open(self.labels_path, 'r', encoding='utf-8') as f:
+                    labels = json.load(f)
+                self._embeds = embeds / np.linalg.norm(embeds, axis=1, keepdims=True)
+                self._labels = labels
+                self._encoder = SentenceTransformer(HOAX_EMBEDDING_MODEL)
+                print(f"[INFO] Loaded {len(labels)} known hoaxes for local matching")
+            except Exception as e:
+                self._embeds = None
+                print(f"[WARNING] Could not load hoax index: {e}")
+    
+    def match(self, claim: str) -> tuple:
+        """
+        Find the closest known hoax.
+        
+        Args:
+            claim: Normalized claim text
+            
+        Returns:
+            (label, similarity) if above HOAX_SIMILARITY_THRESHOLD, else None
+        """
+        if not self._loaded:
+            self._load()
+        if self._embeds is None:
+            return None
+        
+        embedding = self._encoder.encode([claim], normalize_embeddings=True)[0]
+        similarities = self._embeds @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] < HOAX_SIMILARITY_THRESHOLD:
+            return None
+        return self._labels[best], float(similarities[best])
+
+
+_hoax_index = _HoaxIndex(os.path.join(os.path.dirname(__file__), '..', '..', 'data'))
+
+
+class _RequestWindow:
+    """Client-side RPM limit: sliding one-minute window of request timestamps."""
+    
+    def __init__(self, rpm: int):
+        self.rpm = rpm
+        self._stamps = deque()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Record a request and return 0 if under the limit, else seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            while self._stamps and now - self._stamps[0] >= 60:
+                self._stamps.popleft()
+            if len(self._stamps) < self.rpm:
+                self._stamps.append(now)
+                return 0.0
+            return 60 - (now - self._stamps[0])
+    
+    def acquire(self):
+        """Block until a request slot is free."""
+        wait = self._reserve()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._reserve()
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request slot is free."""
+        wait = self._reserve()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._reserve()
+
+
+# Shared by every tool instance since the quota is per API key
+_request_window = _RequestWindow(int(os.getenv("GEMINI_RPM", "60")))
+
+_date_cache = {"expires": 0.0, "value": ""}
+
+
+def _current_date() -> str:
+    """Today's date for prompts, reformatted at most once a minute."""
+    now = time.monotonic()
+    if now >= _date_cache["expires"]:
+        _date_cache["value"] = datetime.now().strftime("%B %d, %Y")
+        _date_cache["expires"] = now + 60
+    return _date_cache["value"]
+
+
+class GeminiFactCheckerTool(BaseTool):
+    # One model (and channel pool) per API key, shared by every instance,
+    # with the event set once its warm-up call has finished
+    _model_cache = {}
+    _model_cache_lock = threading.Lock()
+    
+    def __init__(self):
+        super().__init__(
+            name="gemini_fact_check",
+            description="Uses Google's Gemini AI with web grounding to fact-check claims."
+        )
+        
+        # Use free Gemini API (Vertex AI has deprecated features)
+        api_key = os.getenv('GOOGLE_API_KEY')
+        if api_key:
+            with self._model_cache_lock:
+                if api_key not in self._model_cache:
+                    genai.configure(api_key=api_key)
+                    # Use Gemini 2.0 Flash Exp (latest experimental model with best reasoning)
+                    model = genai.GenerativeModel('gemini-2.0-flash-exp')
+                    self._model_cache[api_key] = (model, threading.Event())
+                    # Open the connection (auth, TLS, HTTP/2) before the first real claim
+                    threading.Thread(target=self._warm, args=self._model_cache[api_key],
+                                     name="gemini-warmup", daemon=True).start()
+                    print("[INFO] Using Gemini 2.0 Flash Exp (latest) for advanced fact-checking with superior reasoning")
+                self.model, self._warmed = self._model_cache[api_key]
+            self.use_vertex = False
+        else:
+            self.model = None
+            self.use_vertex = False
+            self._warmed = threading.Event()
+            self._warmed.set()
+            print("[WARNING] GOOGLE_API_KEY not found in .env file")
+        
+        # Cap on in-flight Gemini calls per event loop for the async API
+        self.max_concurrency = int(os.getenv("GEMINI_CONCURRENCY", "5"))
+        self._semaphores = weakref.WeakKeyDictionary()
+        
+        # Optional list of debunked claims answered without an API call
+        data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+        self._known_false = self._load_known_false(os.path.join(data_dir, 'known_false_claims.json'))
+    
+    def run(self, claim: str, context: str = "", include_metadata: bool = False) -> dict:
+        """
+        Fact-checks a claim using Gemini AI with web grounding.
+        
+        Args:
+            claim: The claim to fact-check
+            context: Additional context about the claim
+            include_metadata: Also return Gemini's grounding metadata
+                (empty for cached results)
+            
+        Returns:
+            Dictionary with fact-check results and sources
+        """
+        if DEBUG:
+            print(f"[DEBUG] Fact-checking claim: '{claim}'")
+            print(f"[DEBUG] Context: '{context}'")
+            print(f"[DEBUG] Model initialized: {self.model is not None}")
+        
+        precheck = self._precheck(claim)
+        if precheck is not None:
+            return precheck
+        
+        cache_key = self._cache_key(claim, context)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            if include_metadata:
+                cached["grounding_metadata"] = []
+            return cached
+        
+        try:
+            if not self.model:
+                return self._not_configured_result()
+            
+            prompt = self._build_prompt(claim, context)
+            self._warmed.wait(timeout=WARMUP_WAIT)
             
             # Generate content with web grounding
             if DEBUG:
                 print("[DEBUG] Calling Gemini API...")
             
             # Free API (relies on web_search_tool for context)
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.1,
-                    "top_p": 0.8,
-                    "top_k": 40,
-                }
-            )
+            response = self._generate_content(prompt, JSON_GENERATION_CONFIG)
             
-            if DEBUG:
-                print(f"[DEBUG] Got response object: {type(response)}")
-                print(f"[DEBUG] Response has text: {hasattr(response, 'text')}")
-            
-            # Parse response
-            result_text = response.text if hasattr(response, 'text') else str(response)
+            result = self._parse_response(claim, response)
+            self._store_cached_result(cache_key, result)
+            if include_metadata:
+                result["grounding_metadata"] = self._grounding_metadata(response)
+            return result
             
-            if DEBUG:
-                print(f"[DEBUG] Result text length: {len(result_text)}")
-                print(f"\n[DEBUG] Gemini Response:\n{result_text}\n")
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def arun(self, claim: str, context: str = "", include_metadata: bool = False) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        Concurrent calls on the same event loop are capped at
+        GEMINI_CONCURRENCY (default 5) in-flight requests.
+        
+        Args:
+            claim: The claim to fact-check
+            context: Additional context about the claim
+            include_metadata: Also return Gemini's grounding metadata
+                (empty for cached results)
             
-            # Extract structured data
-            verdict = self._extract_field(result_text, "VERDICT")
-            confidence = float(self._extract_field(result_text, "CONFIDENCE", "0.5"))
-            relevance_score = float(self._extract_field(result_text, "RELEVANCE_SCORE", "0.5"))
-            claim_significance = self._extract_field(result_text, "CLAIM_SIGNIFICANCE", "MAJOR")
-            misinfo_pattern = self._extract_field(result_text, "MISINFORMATION_PATTERN", "NONE")
-            pattern_confidence = float(self._extract_field(result_text, "PATTERN_CONFIDENCE", "0.0"))
-            weighted_score = float(self._extract_field(result_text, "WEIGHTED_SCORE", str(confidence)))
-            temporal_status = self._extract_field(result_text, "TEMPORAL_STATUS", "UNCLEAR")
-            time_verification = self._extract_field(result_text, "TIME_VERIFICATION", "")
-            explanation = self._extract_field(result_text, "EXPLANATION")
-            evidence = self._extract_list(result_text, "KEY_EVIDENCE")
-            sources = self._extract_list(result_text, "SOURCES")
-            twitter_consensus = self._extract_field(result_text, "TWITTER_CONSENSUS", "")
-            warnings = self._extract_list(result_text, "WARNINGS")
+        Returns:
+            Dictionary with fact-check results and sources
+        """
+        precheck = self._precheck(claim)
+        if precheck is not None:
+            return precheck
+        
+        cache_key = self._cache_key(claim, context)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            if include_metadata:
+                cached["grounding_metadata"] = []
+            return cached
+        
+        try:
+            if not self.model:
+                return self._not_configured_result()
             
-            # If relevance is very low, adjust confidence
-            if relevance_score < 0.3:
-                confidence = min(confidence, 0.2)
-                if not any("irrelevant" in w.lower() for w in warnings):
-                    warnings.insert(0, "⚠️ Search results were not relevant to the claim")
+            prompt = self._build_prompt(claim, context)
             
-            # If misinformation pattern detected with high confidence, add warning
-            if misinfo_pattern != "NONE" and pattern_confidence > 0.6:
-                warnings.insert(0, f"🚨 Matches common misinformation pattern: {misinfo_pattern} ({pattern_confidence*100:.0f}% confidence)")
-                # Boost FALSE/LIKELY_FALSE verdict confidence if pattern suggests misinformation
-                if verdict in ["FALSE", "LIKELY_FALSE", "UNCERTAIN"]:
-                    confidence = max(confidence, pattern_confidence * 0.8)
+            async with self._semaphore():
+                response = await self._generate_content_async(prompt, JSON_GENERATION_CONFIG)
             
-            # Add detailed explanation for LIKELY_FALSE verdicts
-            if verdict == "LIKELY_FALSE" and claim_significance == "MAJOR":
-                if "absence of credible sources" not in explanation.lower():
-                    explanation += "\n\n💡 Analysis: The absence of credible sources for such a significant claim strongly suggests it is false. Real events of this magnitude generate immediate, widespread, and verifiable coverage from multiple news outlets."
+            result = self._parse_response(claim, response)
+            self._store_cached_result(cache_key, result)
+            if include_metadata:
+                result["grounding_metadata"] = self._grounding_metadata(response)
+            return result
             
-            # Get grounding metadata if available
-            grounding_metadata = []
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'grounding_metadata'):
-                    grounding_metadata = candidate.grounding_metadata
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def run_many(self, claims: list, context: str = "") -> list:
+        """
+        Fact-checks several claims concurrently.
+        
+        Args:
+            claims: Claims to fact-check
+            context: Additional context shared by all claims
             
-            return {
-                "verdict": verdict,
-                "confidence": confidence,
-                "relevance_score": relevance_score,
-                "claim_significance": claim_significance,
-                "misinformation_pattern": misinfo_pattern if misinfo_pattern != "NONE" else None,
-                "pattern_confidence": pattern_confidence,
-                "weighted_score": weighted_score,
-                "temporal_status": temporal_status,
-                "time_verification": time_verification,
-                "explanation": explanation,
-                "key_evidence": evidence,
-                "sources": sources,
-                "twitter_consensus": twitter_consensus,
-                "warnings": warnings,
-                "grounding_metadata": grounding_metadata,
-                "full_response": result_text,
-                "claim": claim
-            }
+        Returns:
+            List of fact-check results in the same order as claims
+        """
+        return await asyncio.gather(*[self.arun(claim, context) for claim in claims])
+    
+    def run_batch(self, claims: list) -> list:
+        """
+        Fact-checks several claims with a single Gemini request.
+        
+        The model returns one JSON verdict per claim (structured output), so
+        N claims cost one request instead of N. Claims missing from the
+        batch response, or the whole batch on failure, fall back to run().
+        
+        Args:
+            claims: Claims as strings or dicts with 'claim' and optional 'context'
             
-        except Exception as e:
-            # Print error for debugging
-            print(f"\n[ERROR] Gemini fact-checking failed: {str(e)}")
-            # Uncomment for full traceback:
-            # import traceback
-            # traceback.print_exc()
+        Returns:
+            List of fact-check results in the same order as claims
+        """
+        items = [c if isinstance(c, dict) else {"claim": c} for c in claims]
+        results = [None] * len(items)
+        
+        pending = []
+        for idx, item in enumerate(items):
+            cached = self._precheck(item["claim"])
+            if cached is None:
+                cached = self._get_cached_result(self._cache_key(item["claim"], item.get("context", "")))
+            if cached is not None:
+                results[idx] = cached
+            else:
+                pending.append(idx)
+        
+        if pending and self.model:
+            try:
+                prompt = self._build_batch_prompt([items[idx] for idx in pending])
+                response = self._generate_content(
+                    prompt,
+                    {
+                        **GENERATION_CONFIG,
+                        "response_mime_type": "application/json",
+                        "response_schema": BATCH_RESPONSE_SCHEMA,
+                    }
+                )
+                
+                for entry in _json_loads(response.text):
+                    position = entry.get("index", 0) - 1
+                    if 0 <= position < len(pending) and results[pending[position]] is None:
+                        idx = pending[position]
+                        item = items[idx]
+                        result = self._build_result(item["claim"], entry, _json_dumps(entry))
+                        self._store_cached_result(self._cache_key(item["claim"], item.get("context", "")), result)
+                        results[idx] = result
+                        
+            except Exception as e:
+                print(f"\n[WARNING] Batched Gemini fact-check failed, checking claims individually: {str(e)}")
+        
+        # Anything not answered by the batch goes through the single-claim path
+        for idx in pending:
+            if results[idx] is None:
+                results[idx] = self.run(items[idx]["claim"], items[idx].get("context", ""))
+        
+        return results
+    
+    def _build_batch_prompt(self, items: list) -> str:
+        """Prompt asking for one JSON verdict per numbered claim."""
+        current_date = _current_date()
+        
+        numbered = "\n\n".join(
+            f"{n}. CLAIM: {item['claim']}" + (f"\n   CONTEXT: {item['context']}" if item.get("context") else "")
+            for n, item in enumerate(items, 1)
+        )
+        
+        return f"""You are an expert fact-checker with real-time web access and advanced temporal verification capabilities. Today's date is {current_date}.
+
+Fact-check each of the following {len(items)} claims independently, using any web search results in its context:
+
+{numbered}
+
+For each claim:
+- Check whether the search results are relevant to the claim (RELEVANCE_SCORE 0.0-1.0). Irrelevant results → UNCERTAIN with low confidence.
+- Check for common misinformation patterns (frequent fraud, political manipulation, health misinformation, sensationalism, temporal manipulation, missing attribution) and give the pattern name (or "NONE") with PATTERN_CONFIDENCE.
+- Apply the absence-of-evidence principle: a MAJOR event with no credible coverage is LIKELY_FALSE or FALSE; a vague or MINOR claim without results is UNVERIFIED.
+- Verify the timeline against today's date and flag old news presented as current (OUTDATED_INFO).
+
+Verdicts: TRUE, FALSE, LIKELY_FALSE, PARTIALLY_TRUE, OUTDATED_INFO, UNVERIFIED, or UNCERTAIN.
+Temporal status: CURRENT, OUTDATED, TIMELESS, or UNCLEAR.
+
+Return a JSON array with exactly one object per claim, using the claim's number as "index".
+"""
+    
+    def _load_known_false(self, path: str) -> set:
+        """Load normalized known-false claims from an optional JSON list."""
+        if not os.path.exists(path):
+            return set()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return {self._normalize(claim).lower() for claim in json.load(f)}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[WARNING] Could not load known-false claims: {e}")
+            return set()
+    
+    def _normalize(self, text: str) -> str:
+        """Collapse runs of whitespace and trim."""
+        return " ".join(text.split())
+    
+    def _precheck(self, claim: str) -> dict:
+        """
+        Answer claims that don't merit a Gemini call: known-false claims,
+        inputs with nothing to verify, and near-matches of curated hoaxes.
+        
+        Args:
+            claim: The claim to fact-check
             
-            return {
-                "error": str(e),
+        Returns:
+            Fact-check result, or None if the claim needs a full check
+        """
+        stripped = self._normalize(claim or "")
+        
+        if stripped.lower() in self._known_false:
+            fields = {
+                "verdict": "FALSE",
+                "confidence": 0.95,
+                "relevance_score": 1.0,
+                "explanation": "This claim matches a previously debunked claim.",
+            }
+        elif len(stripped) < MIN_CLAIM_LENGTH or URL_ONLY_PATTERN.fullmatch(stripped):
+            fields = {
                 "verdict": "UNCERTAIN",
                 "confidence": 0.0,
-                "temporal_status": "UNCLEAR",
-                "explanation": f"Error during fact-checking: {str(e)}",
-                "key_evidence": [],
-                "sources": [],
-                "warnings": []
+                "relevance_score": 1.0,
+                "explanation": "The input is too short or only a link, so there is no claim to verify.",
+                "warnings": ["⚠️ No verifiable claim found in the input"],
+            }
+        else:
+            hoax = _hoax_index.match(stripped)
+            if hoax is None:
+                return None
+            label, similarity = hoax
+            fields = {
+                "verdict": "FALSE",
+                "confidence": similarity,
+                "relevance_score": 1.0,
+                "misinformation_pattern": label,
+                "pattern_confidence": similarity,
+                "explanation": "This claim closely matches a known hoax.",
             }
+        
+        return self._build_result(claim, fields, "")
+    
+    def _cache_key(self, claim: str, context: str) -> bytes:
+        """Cache key for a (claim, context) pair, ignoring whitespace differences."""
+        key = hashlib.blake2b(digest_size=16)
+        key.update(self._normalize(claim).encode())
+        key.update(b"\x00")
+        key.update(self._normalize(context).encode())
+        return key.digest()
+    
+    def _get_cached_result(self, key: bytes) -> dict:
+        """Return a copy of a fresh cached result (memory, then disk), or None."""
+        with _result_cache_lock:
+            entry = _result_cache.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if time.monotonic() - stored_at > RESULT_CACHE_TTL:
+                    del _result_cache[key]
+                    entry = None
+                else:
+                    _result_cache.move_to_end(key)
+        
+        if entry is None:
+            try:
+                result = _result_store.get(key)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"[WARNING] Fact-check disk cache read failed: {e}")
+                return None
+            if result is None:
+                return None
+            self._remember_result(key, result)
+        
+        if DEBUG:
+            print("[DEBUG] Returning cached fact-check result")
+        return self._copy_result(result)
     
-    def _extract_field(self, text: str, field: str, default: str = "") -> str:
-        """Extract a field from the response text."""
+    def _store_cached_result(self, key: bytes, result: dict):
+        """Remember a successful result in memory and on disk."""
+        self._remember_result(key, result)
         try:
-            lines = text.split('\n')
-            for line in lines:
-                if line.strip().startswith(f"{field}:"):
-                    return line.split(':', 1)[1].strip()
-            return default
-        except:
-            return default
-    
-    def _extract_list(self, text: str, section: str) -> list:
-        """Extract a list section from the response text."""
+            _result_store.put(key, result)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"[WARNING] Fact-check disk cache write failed: {e}")
+    
+    def _remember_result(self, key: bytes, result: dict):
+        """Add a result to the in-memory cache, evicting the least recently used."""
+        with _result_cache_lock:
+            _result_cache[key] = (time.monotonic(), self._copy_result(result))
+            _result_cache.move_to_end(key)
+            while len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+    
+    def _copy_result(self, result: dict) -> dict:
+        """Copy a result so callers can't mutate the cached lists."""
+        return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+    
+    def _warm(self, model, warmed: threading.Event):
+        """Issue a 1-token request so later calls find the connection pool hot."""
         try:
-            lines = text.split('\n')
-            items = []
-            in_section = False
-            
-            for line in lines:
-                if line.strip().startswith(f"{section}:"):
-                    in_section = True
-                    continue
-                if in_section:
-                    if line.strip().startswith('-'):
-                        items.append(line.strip()[1:].strip())
-                    elif line.strip() and not line.strip().startswith('-'):
-                        # End of section
-                        break
+            _request_window.acquire()
+            model.generate_content("ok", generation_config={"max_output_tokens": 1})
+        except Exception as e:
+            if DEBUG:
+                print(f"[DEBUG] Gemini warm-up failed: {e}")
+        finally:
+            warmed.set()
+    
+    def _generate_content(self, prompt: str, generation_config: dict):
+        """Call Gemini, retrying quota and transient server errors with backoff."""
+        return self._call_with_retry(
+            lambda: self.model.generate_content(prompt, generation_config=generation_config)
+        )
+    
+    def _call_with_retry(self, call):
+        """Run a Gemini call, retrying quota and transient server errors with backoff."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                _request_window.acquire()
+                return call()
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"[WARNING] Gemini call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    async def _generate_content_async(self, prompt: str, generation_config: dict):
+        """
+        Call Gemini without blocking the event loop.
+        
+        Uses the SDK's native async call when available, otherwise runs the
+        sync call in a worker thread (bounded by the caller's semaphore).
+        Retries like _generate_content.
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                await _request_window.acquire_async()
+                if hasattr(self.model, 'generate_content_async'):
+                    return await self.model.generate_content_async(prompt, generation_config=generation_config)
+                return await asyncio.to_thread(self.model.generate_content, prompt, generation_config=generation_config)
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"[WARNING] Gemini call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter: 10s, 20s, 40s, ... capped."""
+        return min(RETRY_BASE_DELAY * (2 ** attempt), RETRY_MAX_DELAY) + random.random()
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent Gemini calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    def _build_prompt(self, claim: str, context: str) -> str:
+        """Construct comprehensive fact-checking prompt with temporal verification."""
+        return PROMPT_TEMPLATE.format_map({
+            "claim": claim,
+            "context_block": f"CONTEXT: {context}" if context else "",
+            "current_date": _current_date(),
+        })
+    
+    def _parse_response(self, claim: str, response) -> dict:
+        """Turn a structured JSON Gemini response into the fact-check result."""
+        if DEBUG:
+            print(f"[DEBUG] Got response object: {type(response)}")
+            print(f"[DEBUG] Response has text: {hasattr(response, 'text')}")
+        
+        result_text = response.text if hasattr(response, 'text') else str(response)
+        
+        if DEBUG:
+            print(f"[DEBUG] Result text length: {len(result_text)}")
+            print(f"\n[DEBUG] Gemini Response:\n{result_text}\n")
+        
+        fields = _json_loads(result_text)
+        return self._build_result(claim, fields, result_text)
+    
+    def _grounding_metadata(self, response):
+        """Get grounding metadata if available."""
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'grounding_metadata'):
+                return candidate.grounding_metadata
+        return []
+    
+    def _build_result(self, claim: str, fields: dict, result_text: str) -> dict:
+        """
+        Apply relevance/pattern adjustments to extracted fields.
+        
+        Args:
+            claim: The claim that was fact-checked
+            fields: Raw fields from the model (verdict, confidence, ...)
+            result_text: Full model output the fields came from (kept only in DEBUG mode)
             
-            return items
-        except:
-            return []
+        Returns:
+            Dictionary with fact-check results and sources
+        """
+        verdict = fields.get("verdict", "")
+        confidence = float(fields.get("confidence", 0.5))
+        relevance_score = float(fields.get("relevance_score", 0.5))
+        claim_significance = fields.get("claim_significance") or "MAJOR"
+        misinfo_pattern = fields.get("misinformation_pattern") or "NONE"
+        pattern_confidence = float(fields.get("pattern_confidence", 0.0))
+        weighted_score = float(fields.get("weighted_score") or confidence)
+        temporal_status = fields.get("temporal_status") or "UNCLEAR"
+        time_verification = fields.get("time_verification", "")
+        explanation = fields.get("explanation", "")
+        evidence = list(fields.get("key_evidence") or [])
+        sources = list(fields.get("sources") or [])
+        twitter_consensus = fields.get("social_media_consensus", "")
+        warnings = list(fields.get("warnings") or [])
+        
+        # If relevance is very low, adjust confidence
+        if relevance_score < 0.3:
+            confidence = min(confidence, 0.2)
+            if not any(IRRELEVANT_PATTERN.search(w) for w in warnings):
+                warnings.insert(0, "⚠️ Search results were not relevant to the claim")
+        
+        # If misinformation pattern detected with high confidence, add warning
+        if misinfo_pattern != "NONE" and pattern_confidence > 0.6:
+            warnings.insert(0, f"🚨 Matches common misinformation pattern: {misinfo_pattern} ({pattern_confidence*100:.0f}% confidence)")
+            # Boost FALSE/LIKELY_FALSE verdict confidence if pattern suggests misinformation
+            if verdict in ["FALSE", "LIKELY_FALSE", "UNCERTAIN"]:
+                confidence = max(confidence, pattern_confidence * 0.8)
+        
+        # Add detailed explanation for LIKELY_FALSE verdicts
+        if verdict == "LIKELY_FALSE" and claim_significance == "MAJOR":
+            if not ABSENCE_PATTERN.search(explanation):
+                explanation += "\n\n💡 Analysis: The absence of credible sources for such a significant claim strongly suggests it is false. Real events of this magnitude generate immediate, widespread, and verifiable coverage from multiple news outlets."
+        
+        result = {
+            "verdict": verdict,
+            "confidence": confidence,
+            "relevance_score": relevance_score,
+            "claim_significance": claim_significance,
+            "misinformation_pattern": misinfo_pattern if misinfo_pattern != "NONE" else None,
+            "pattern_confidence": pattern_confidence,
+            "weighted_score": weighted_score,
+            "temporal_status": temporal_status,
+            "time_verification": time_verification,
+            "explanation": explanation,
+            "key_evidence": evidence,
+            "sources": sources,
+            "twitter_consensus": twitter_consensus,
+            "warnings": warnings,
+            "claim": claim
+        }
+        if DEBUG:
+            result["full_response"] = result_text
+        return result
+    
+    def _not_configured_result(self) -> dict:
+        """Result returned when no Gemini API key is configured."""
+        return {
+            "error": "Gemini model not configured. Set GOOGLE_API_KEY environment variable.",
+            "verdict": "UNCERTAIN",
+            "confidence": 0.0,
+            "temporal_status": "UNCLEAR",
+            "explanation": "",
+            "key_evidence": [],
+            "sources": [],
+            "warnings": []
+        }
+    
+    def _error_result(self, e: Exception) -> dict:
+        """Result returned when the Gemini call or parsing fails."""
+        # Print error for debugging
+        print(f"\n[ERROR] Gemini fact-checking failed: {str(e)}")
+        # Uncomment for full traceback:
+        # import traceback
+        # traceback.print_exc()
+        
+        return {
+            "error": str(e),
+            "verdict": "UNCERTAIN",
+            "confidence": 0.0,
+            "temporal_status": "UNCLEAR",
+            "explanation": f"Error during fact-checking: {str(e)}",
+            "key_evidence": [],
+            "sources": [],
+            "warnings": []
+        }
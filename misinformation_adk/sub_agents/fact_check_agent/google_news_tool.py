@@ -1,9 +1,73 @@
 from google.adk.tools.base_tool import BaseTool
 import requests
-from bs4 import BeautifulSoup
+import asyncio
+import functools
+import io
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import json
+import lxml.html
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+try:
+    import tldextract
+    # Use the bundled public suffix list rather than fetching it at runtime
+    _extract_domain = tldextract.TLDExtract(suffix_list_urls=())
+    TLDEXTRACT_AVAILABLE = True
+except ImportError:
+    TLDEXTRACT_AVAILABLE = False
+from .http_session import HEADERS, SESSION
+
+# Registered domains (without the public suffix) of trusted outlets
+TRUSTED_DOMAINS = frozenset([
+    'reuters', 'apnews', 'bbc', 'nytimes', 'theguardian', 'washingtonpost',
+    'npr', 'cnn', 'bloomberg', 'economist', 'forbes', 'wired',
+    'thehindu', 'indianexpress', 'indiatimes', 'ndtv', 'hindustantimes',
+    'aljazeera', 'france24', 'dw'
+])
+
+# Second-level labels under a country TLD, e.g. bbc.co.uk (used without tldextract)
+_SECOND_LEVEL_LABELS = frozenset(['co', 'com', 'org', 'net', 'gov', 'ac', 'edu'])
+
+# Articles published within this window count as recent
+RECENT_WINDOW = timedelta(days=180)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(date_str: str):
+    """Parse an RSS (RFC 822) or Custom Search (ISO 8601) date as aware UTC, or None."""
+    try:
+        parsed = parsedate_to_datetime(date_str)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@functools.lru_cache(maxsize=4096)
+def _registered_domain(url: str) -> str:
+    """Registered domain label of a URL or bare hostname ('www.bbc.co.uk' -> 'bbc')."""
+    if '://' not in url:
+        url = '//' + url
+    host = (urlsplit(url).hostname or '').rstrip('.')
+    if TLDEXTRACT_AVAILABLE:
+        return _extract_domain(host).domain
+    
+    labels = host.split('.')
+    if len(labels) >= 3 and labels[-2] in _SECOND_LEVEL_LABELS and len(labels[-1]) == 2:
+        return labels[-3]
+    return labels[-2] if len(labels) >= 2 else host
 
 class GoogleNewsTool(BaseTool):
     def __init__(self):
@@ -35,75 +99,102 @@ class GoogleNewsTool(BaseTool):
                 # Fallback to RSS feed method (free, no API key)
                 results = self._google_news_rss(query, num_results)
             
-            # Analyze news credibility
-            credible_news = self._analyze_news_credibility(results)
+            return self._build_result(query, results)
             
-            # Extract date patterns
-            temporal_info = self._analyze_temporal_patterns(results)
-            
-            return {
-                "query": query,
-                "news_articles": results,
-                "credible_news": credible_news,
-                "temporal_info": temporal_info,
-                "total_articles": len(results),
-                "source": "Google News"
-            }
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_async(self, query: str, num_results: int = 10, session=None) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        Args:
+            query: Search query
+            num_results: Number of news articles to return
+            session: Optional aiohttp.ClientSession to share between calls
             
+        Returns:
+            Dictionary with news articles and analysis
+        """
+        # Custom Search and installs without aiohttp use the sync path in a thread
+        if not AIOHTTP_AVAILABLE or (self.api_key and self.search_engine_id):
+            return await asyncio.to_thread(self.run, query, num_results)
+        
+        if session is None:
+            async with aiohttp.ClientSession(headers=HEADERS) as session:
+                return await self.run_async(query, num_results, session)
+        
+        try:
+            results = await self._google_news_rss_async(session, query, num_results)
+            return self._build_result(query, results)
         except Exception as e:
-            print(f"[GOOGLE NEWS ERROR] {e}")
-            return {
-                "error": str(e),
-                "query": query,
-                "news_articles": [],
-                "total_articles": 0
-            }
+            return self._error_result(query, e)
+    
+    async def run_many(self, queries: list, num_results: int = 10) -> list:
+        """
+        Searches Google News for several queries concurrently.
+        
+        Args:
+            queries: Search queries
+            num_results: Number of news articles to return per query
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.gather(*[self.run_async(q, num_results) for q in queries])
+        
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await asyncio.gather(*[self.run_async(q, num_results, session) for q in queries])
+    
+    def _build_result(self, query: str, results: list) -> dict:
+        """Analyze fetched articles into the tool's response."""
+        # Analyze news credibility
+        credible_news = self._analyze_news_credibility(results)
+        
+        # Extract date patterns
+        temporal_info = self._analyze_temporal_patterns(results)
+        
+        return {
+            "query": query,
+            "news_articles": results,
+            "credible_news": credible_news,
+            "temporal_info": temporal_info,
+            "total_articles": len(results),
+            "source": "Google News"
+        }
+    
+    def _error_result(self, query: str, e: Exception) -> dict:
+        """Response returned when the search fails."""
+        print(f"[GOOGLE NEWS ERROR] {e}")
+        return {
+            "error": str(e),
+            "query": query,
+            "news_articles": [],
+            "total_articles": 0
+        }
     
     def _google_custom_search(self, query: str, num_results: int) -> list:
         """Use Google Custom Search API with News focus."""
         try:
-            # Google Custom Search API endpoint
-            base_url = "https://www.googleapis.com/customsearch/v1"
+            # Pages of up to 10 results, fetched concurrently
+            starts = list(range(1, num_results + 1, 10))
+            if len(starts) == 1:
+                pages = [self._custom_search_page(query, 1, num_results)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(8, len(starts))) as executor:
+                    pages = list(executor.map(
+                        lambda start: self._custom_search_page(query, start, min(10, num_results - start + 1)),
+                        starts
+                    ))
             
+            # Keep page order; stop at the first page that failed
             results = []
-            
-            # Fetch results (max 10 per request)
-            for start in range(1, num_results + 1, 10):
-                params = {
-                    'key': self.api_key,
-                    'cx': self.search_engine_id,
-                    'q': query,
-                    'num': min(10, num_results - len(results)),
-                    'start': start,
-                    'dateRestrict': 'm6',  # Last 6 months
-                    'sort': 'date',  # Sort by date
-                    'siteSearch': 'news.google.com OR reuters.com OR apnews.com OR bbc.com',
-                    'siteSearchFilter': 'i'  # Include these sites
-                }
-                
-                response = requests.get(base_url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for item in data.get('items', []):
-                        results.append({
-                            'title': item.get('title', ''),
-                            'url': item.get('link', ''),
-                            'snippet': item.get('snippet', ''),
-                            'source': item.get('displayLink', ''),
-                            'date': item.get('pagemap', {}).get('metatags', [{}])[0].get('article:published_time', 'Unknown'),
-                            'type': 'news'
-                        })
-                        
-                        if len(results) >= num_results:
-                            break
-                    
-                    if len(results) >= num_results:
-                        break
-                else:
-                    print(f"[GOOGLE NEWS] API returned status {response.status_code}")
+            for page in pages:
+                if page is None:
                     break
+                results.extend(page)
+            results = results[:num_results]
             
             print(f"[GOOGLE NEWS] Found {len(results)} articles via Custom Search API")
             return results
@@ -113,42 +204,67 @@ class GoogleNewsTool(BaseTool):
             # Fallback to RSS
             return self._google_news_rss(query, num_results)
     
+    def _custom_search_page(self, query: str, start: int, num: int) -> list:
+        """Fetch one Custom Search results page, or None if the API refused it."""
+        # Google Custom Search API endpoint
+        base_url = "https://www.googleapis.com/customsearch/v1"
+        params = {
+            'key': self.api_key,
+            'cx': self.search_engine_id,
+            'q': query,
+            'num': num,
+            'start': start,
+            'dateRestrict': 'm6',  # Last 6 months
+            'sort': 'date',  # Sort by date
+            'siteSearch': 'news.google.com OR reuters.com OR apnews.com OR bbc.com',
+            'siteSearchFilter': 'i'  # Include these sites
+        }
+        
+        response = SESSION.get(base_url, params=params, timeout=10)
+        
+        if response.status_code != 200:
+            print(f"[GOOGLE NEWS] API returned status {response.status_code}")
+            return None
+        
+        return [
+            {
+                'title': item.get('title', ''),
+                'url': item.get('link', ''),
+                'snippet': item.get('snippet', ''),
+                'source': item.get('displayLink', ''),
+                'date': item.get('pagemap', {}).get('metatags', [{}])[0].get('article:published_time', 'Unknown'),
+                'type': 'news'
+            }
+            for item in response.json().get('items', [])
+        ]
+    
     def _google_news_rss(self, query: str, num_results: int) -> list:
         """Use Google News RSS feeds (FREE, no API key needed)."""
         try:
-            # Google News RSS URL
-            rss_url = f"https://news.google.com/rss/search?q={requests.utils.quote(query)}&hl=en-IN&gl=IN&ceid=IN:en"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(rss_url, headers=headers, timeout=15)
+            response = SESSION.get(self._rss_url(query), timeout=15)
             
             if response.status_code != 200:
                 print(f"[GOOGLE NEWS RSS] Failed with status {response.status_code}")
                 return []
             
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')[:num_results]
+            results = self._parse_rss(response.content, num_results)
+            print(f"[GOOGLE NEWS RSS] Found {len(results)} articles for: {query}")
+            return results
             
-            results = []
-            for item in items:
-                title = item.find('title')
-                link = item.find('link')
-                description = item.find('description')
-                pub_date = item.find('pubDate')
-                source = item.find('source')
-                
-                results.append({
-                    'title': title.text if title else '',
-                    'url': link.text if link else '',
-                    'snippet': BeautifulSoup(description.text if description else '', 'html.parser').get_text(strip=True),
-                    'source': source.text if source else 'Google News',
-                    'date': pub_date.text if pub_date else '',
-                    'type': 'news'
-                })
+        except Exception as e:
+            print(f"[GOOGLE NEWS RSS ERROR] {e}")
+            return []
+    
+    async def _google_news_rss_async(self, session, query: str, num_results: int) -> list:
+        """Async variant of _google_news_rss using an aiohttp session."""
+        try:
+            async with session.get(self._rss_url(query), timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status != 200:
+                    print(f"[GOOGLE NEWS RSS] Failed with status {response.status}")
+                    return []
+                content = await response.read()
             
+            results = self._parse_rss(content, num_results)
             print(f"[GOOGLE NEWS RSS] Found {len(results)} articles for: {query}")
             return results
             
@@ -156,21 +272,43 @@ class GoogleNewsTool(BaseTool):
             print(f"[GOOGLE NEWS RSS ERROR] {e}")
             return []
     
+    def _rss_url(self, query: str) -> str:
+        """Google News RSS search URL for a query."""
+        return f"https://news.google.com/rss/search?q={requests.utils.quote(query)}&hl=en-IN&gl=IN&ceid=IN:en"
+    
+    def _parse_rss(self, content: bytes, num_results: int) -> list:
+        """Parse up to num_results items from a Google News RSS feed."""
+        # Google News always serves plain RSS 2.0 (rss/channel/item, no namespaces),
+        # so let lxml hand us only the <item> elements and stop once we have enough
+        results = []
+        for _, element in etree.iterparse(io.BytesIO(content), events=('end',), tag='item'):
+            description = element.findtext('description', '').strip()
+            source = element.find('source')
+            
+            results.append({
+                'title': element.findtext('title', ''),
+                'url': element.findtext('link', ''),
+                'snippet': lxml.html.fromstring(description).text_content().strip() if description else '',
+                'source': (source.text if source is not None else None) or 'Google News',
+                'source_url': source.get('url', '') if source is not None else '',
+                'date': element.findtext('pubDate', ''),
+                'type': 'news'
+            })
+            element.clear()
+            
+            if len(results) >= num_results:
+                break
+        
+        return results
+    
     def _analyze_news_credibility(self, articles: list) -> list:
         """Filter for credible news sources."""
-        trusted_sources = [
-            'reuters', 'apnews', 'bbc', 'nytimes', 'theguardian', 'washingtonpost',
-            'npr', 'cnn', 'bloomberg', 'economist', 'forbes', 'wired',
-            'thehindu', 'indianexpress', 'timeofindia', 'ndtv', 'hindustantimes',
-            'aljazeera', 'france24', 'dw.com'
-        ]
-        
         credible = []
         for article in articles:
-            url = article.get('url', '').lower()
-            source = article.get('source', '').lower()
-            
-            if any(trusted in url or trusted in source for trusted in trusted_sources):
+            # RSS links go through news.google.com, so also check the publisher's
+            # own site; Custom Search puts the publisher's hostname in 'source'
+            if (_registered_domain(article.get('url', '')) in TRUSTED_DOMAINS
+                    or _registered_domain(article.get('source_url') or article.get('source', '')) in TRUSTED_DOMAINS):
                 credible.append(article)
         
         return credible
@@ -182,19 +320,18 @@ class GoogleNewsTool(BaseTool):
         
         recent_count = 0
         old_count = 0
+        cutoff = datetime.now(timezone.utc) - RECENT_WINDOW
         
-        # Simple date analysis
         for article in articles:
             date_str = article.get('date', '')
             if date_str and date_str != 'Unknown':
-                try:
-                    # Try parsing date
-                    if '2024' in date_str or '2025' in date_str:
-                        recent_count += 1
-                    else:
-                        old_count += 1
-                except:
-                    pass
+                published = _parse_date(date_str)
+                if published is None:
+                    continue
+                if published >= cutoff:
+                    recent_count += 1
+                else:
+                    old_count += 1
         
         pattern = "RECENT" if recent_count > old_count else "OLDER" if old_count > 0 else "UNCLEAR"
         
@@ -0,0 +1,68 @@
+import os
+import requests
+from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from requests_cache import DEFAULT_IGNORED_PARAMS, CachedSession
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Responses are reused for 30 minutes by default; news feeds change slowly,
+# Reddit search quickly
+CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'http_cache')
+CACHE_EXPIRE_AFTER = timedelta(minutes=30)
+CACHE_URLS_EXPIRE_AFTER = {
+    'news.google.com/rss/search': timedelta(hours=6),
+    '*.reddit.com/search.json': timedelta(minutes=5),
+}
+
+
+def _create_session(cached: bool = True) -> requests.Session:
+    """Pooled session shared by the news and social media tools, cached on disk if possible."""
+    if cached and REQUESTS_CACHE_AVAILABLE:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        session = CachedSession(
+            CACHE_PATH,
+            backend='sqlite',
+            expire_after=CACHE_EXPIRE_AFTER,
+            urls_expire_after=CACHE_URLS_EXPIRE_AFTER,
+            allowable_methods=('GET',),
+            stale_if_error=True,
+            # Keep credentials (the defaults, e.g. Authorization, plus the Custom
+            # Search API key) out of cache keys and stored responses
+            ignored_parameters=[*DEFAULT_IGNORED_PARAMS, 'key']
+        )
+    else:
+        session = requests.Session()
+    session.headers.update(HEADERS)
+    
+    # Retry gateway errors, but not read timeouts: a dead mirror should
+    # cost one timeout, not four
+    retry = Retry(
+        total=3,
+        connect=1,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Keeps TCP/TLS connections to news.google.com, reddit.com and the Nitter
+# mirrors alive between calls
+SESSION = _create_session()
+
+# Same pooling without the disk cache, for authenticated APIs whose
+# responses must not be written to disk
+UNCACHED_SESSION = _create_session(cached=False)
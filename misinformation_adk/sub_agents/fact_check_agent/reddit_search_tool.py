@@ -1,8 +1,44 @@
 from google.adk.tools.base_tool import BaseTool
-import requests
 from bs4 import BeautifulSoup
+import asyncio
 import json
 import os
+import re
+import numpy as np
+from collections import Counter
+from itertools import islice
+from operator import itemgetter
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+from .http_session import HEADERS, SESSION
+
+# Reddit's free JSON API endpoint
+SEARCH_URL = "https://www.reddit.com/search.json"
+
+# Keywords for sentiment analysis, matched against the post's words
+POSITIVE_KEYWORDS = frozenset(['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual', 'legit', 'real'])
+NEGATIVE_KEYWORDS = frozenset(['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax', 'bs', 'lie', 'misleading'])
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Number of posts returned as examples with the analysis
+SAMPLE_SIZE = 5
+
+# Fields read from each post in a search listing
+POST_FIELDS = itemgetter('title', 'selftext', 'subreddit', 'score', 'num_comments', 'permalink', 'created_utc')
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, with orjson when installed."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
 
 class RedditSearchTool(BaseTool):
     def __init__(self):
@@ -20,92 +56,186 @@ class RedditSearchTool(BaseTool):
         Args:
             query: Search query
             max_results: Maximum number of posts to analyze
-            
+        
         Returns:
             Dictionary with Reddit analysis and consensus
         """
         try:
             # Search Reddit posts
             posts = self._search_reddit(query, max_results)
-            
-            if not posts:
-                return {
-                    "query": query,
-                    "posts_analyzed": 0,
-                    "consensus": "NO_DATA",
-                    "sentiment": "neutral",
-                    "message": "No Reddit posts found for this query"
-                }
-            
-            # Analyze sentiment and consensus
-            analysis = self._analyze_posts(posts)
-            
-            return {
-                "query": query,
-                "posts_analyzed": len(posts),
-                "consensus": analysis['consensus'],
-                "sentiment": analysis['sentiment'],
-                "top_subreddits": analysis['top_subreddits'],
-                "sample_posts": posts[:5],  # Return sample
-                "metrics": analysis['metrics']
-            }
-            
+            return self._build_result(query, posts)
+        
         except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_async(self, query: str, max_results: int = 20, session=None) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of posts to analyze
+            session: Optional aiohttp.ClientSession to share between calls
+        
+        Returns:
+            Dictionary with Reddit analysis and consensus
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.run, query, max_results)
+        
+        if session is None:
+            async with aiohttp.ClientSession(headers=HEADERS) as session:
+                return await self.run_async(query, max_results, session)
+        
+        try:
+            posts = await self._search_reddit_async(session, query, max_results)
+            return self._build_result(query, posts)
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_many(self, queries: list, max_results: int = 20) -> list:
+        """
+        Searches Reddit for several queries concurrently.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of posts to analyze per query
+        
+        Returns:
+            List of results in the same order as queries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.gather(*[self.run_async(q, max_results) for q in queries])
+        
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await asyncio.gather(*[self.run_async(q, max_results, session) for q in queries])
+    
+    def _build_result(self, query: str, posts: list) -> dict:
+        """Analyze fetched posts into the tool's response."""
+        if not posts:
             return {
-                "error": str(e),
                 "query": query,
                 "posts_analyzed": 0,
-                "consensus": "ERROR"
+                "consensus": "NO_DATA",
+                "sentiment": "neutral",
+                "message": "No Reddit posts found for this query"
             }
+        
+        # Analyze sentiment and consensus
+        analysis = self._analyze_posts(posts)
+        
+        return {
+            "query": query,
+            "posts_analyzed": len(posts),
+            "consensus": analysis['consensus'],
+            "sentiment": analysis['sentiment'],
+            "top_subreddits": analysis['top_subreddits'],
+            "sample_posts": analysis['sample_posts'],
+            "metrics": analysis['metrics']
+        }
+    
+    def _error_result(self, query: str, e: Exception) -> dict:
+        """Response returned when the search fails."""
+        return {
+            "error": str(e),
+            "query": query,
+            "posts_analyzed": 0,
+            "consensus": "ERROR"
+        }
     
     def _search_reddit(self, query: str, max_results: int) -> list:
         """Search Reddit using free JSON API."""
+        print(f"[REDDIT] Searching for: '{query}'")
+        posts = []
         try:
-            # Reddit's free JSON API endpoint
-            url = f"https://www.reddit.com/search.json"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            params = {
-                'q': query,
-                'limit': min(max_results, 100),
-                'sort': 'relevance',
-                't': 'month'  # Last month
-            }
-            
-            print(f"[REDDIT] Searching for: '{query}'")
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            for post in islice(self._iter_posts(query, max_results), max_results):
+                posts.append(post)
+        except Exception as e:
+            # Keep whatever earlier pages returned
+            print(f"[REDDIT ERROR] Search failed: {e}")
+        
+        self._log_found(posts)
+        return posts
+    
+    def _iter_posts(self, query: str, max_results: int):
+        """Yield search results page by page, following Reddit's after= cursor."""
+        after = None
+        while True:
+            response = SESSION.get(SEARCH_URL, params=self._search_params(query, max_results, after), timeout=10)
             
             if response.status_code != 200:
                 print(f"[REDDIT ERROR] API error: {response.status_code}")
-                return []
-            
-            data = response.json()
-            posts_data = data.get('data', {}).get('children', [])
+                return
             
-            if not posts_data:
-                print(f"[REDDIT] No posts found")
-                return []
-            
-            posts = []
-            for post in posts_data:
-                post_data = post.get('data', {})
-                posts.append({
-                    'title': post_data.get('title', ''),
-                    'text': post_data.get('selftext', ''),
-                    'subreddit': post_data.get('subreddit', ''),
-                    'score': post_data.get('score', 0),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                    'created_utc': post_data.get('created_utc', 0)
-                })
-            
-            print(f"[REDDIT] Found {len(posts)} posts")
-            return posts
+            data = _json_loads(response.content)
+            yield from self._parse_posts(data)
             
+            after = data.get('data', {}).get('after')
+            if not after:
+                return
+    
+    async def _search_reddit_async(self, session, query: str, max_results: int) -> list:
+        """Async variant of _search_reddit using an aiohttp session."""
+        print(f"[REDDIT] Searching for: '{query}'")
+        posts = []
+        after = None
+        try:
+            while len(posts) < max_results:
+                async with session.get(SEARCH_URL, params=self._search_params(query, max_results, after),
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status != 200:
+                        print(f"[REDDIT ERROR] API error: {response.status}")
+                        break
+                    data = _json_loads(await response.read())
+                
+                posts.extend(self._parse_posts(data))
+                
+                after = data.get('data', {}).get('after')
+                if not after:
+                    break
         except Exception as e:
+            # Keep whatever earlier pages returned
             print(f"[REDDIT ERROR] Search failed: {e}")
-            return []
+        
+        posts = posts[:max_results]
+        self._log_found(posts)
+        return posts
+    
+    def _search_params(self, query: str, max_results: int, after: str = None) -> dict:
+        """Query parameters for one page of a Reddit search request."""
+        params = {
+            'q': query,
+            'limit': min(max_results, 100),  # Reddit's page size cap
+            'sort': 'relevance',
+            't': 'month'  # Last month
+        }
+        if after:
+            params['after'] = after
+        return params
+    
+    def _parse_posts(self, data: dict) -> list:
+        """Extract the fields we use from one page of a Reddit search listing."""
+        posts = []
+        for post in data.get('data', {}).get('children', []):
+            title, text, subreddit, score, num_comments, permalink, created_utc = POST_FIELDS(post['data'])
+            posts.append({
+                'title': title,
+                'text': text,
+                'subreddit': subreddit,
+                'score': score,
+                'num_comments': num_comments,
+                'url': f"https://reddit.com{permalink}",
+                'created_utc': created_utc
+            })
+        
+        return posts
+    
+    def _log_found(self, posts: list):
+        """Report how many posts a search collected."""
+        if posts:
+            print(f"[REDDIT] Found {len(posts)} posts")
+        else:
+            print(f"[REDDIT] No posts found")
     
     def _analyze_posts(self, posts: list) -> dict:
         """Analyze Reddit posts for sentiment and consensus."""
@@ -114,37 +244,29 @@ class RedditSearchTool(BaseTool):
                 'consensus': 'NO_DATA',
                 'sentiment': 'neutral',
                 'top_subreddits': [],
+                'sample_posts': [],
                 'metrics': {}
             }
         
-        # Keywords for sentiment analysis
-        positive_keywords = ['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual', 'legit', 'real']
-        negative_keywords = ['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax', 'bs', 'lie', 'misleading']
+        total = len(posts)
         
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        subreddits = {}
+        # Count subreddits, keep a sample and tokenize title + text in one pass
+        subreddits = Counter()
+        sample = []
+        words = []
+        for i, post in enumerate(posts):
+            subreddits[post.get('subreddit', 'unknown')] += 1
+            if i < SAMPLE_SIZE:
+                sample.append(post)
+            text = ' '.join((post.get('title', ''), post.get('text', ''))).lower()
+            words.append(set(WORD_PATTERN.findall(text)))
         
-        for post in posts:
-            # Combine title and text for analysis
-            text = (post.get('title', '') + ' ' + post.get('text', '')).lower()
-            subreddit = post.get('subreddit', 'unknown')
-            
-            # Count subreddits
-            subreddits[subreddit] = subreddits.get(subreddit, 0) + 1
-            
-            has_positive = any(kw in text for kw in positive_keywords)
-            has_negative = any(kw in text for kw in negative_keywords)
-            
-            if has_positive and not has_negative:
-                positive_count += 1
-            elif has_negative and not has_positive:
-                negative_count += 1
-            else:
-                neutral_count += 1
+        has_positive = np.fromiter((not w.isdisjoint(POSITIVE_KEYWORDS) for w in words), dtype=bool, count=total)
+        has_negative = np.fromiter((not w.isdisjoint(NEGATIVE_KEYWORDS) for w in words), dtype=bool, count=total)
         
-        total = len(posts)
+        positive_count = int((has_positive & ~has_negative).sum())
+        negative_count = int((has_negative & ~has_positive).sum())
+        neutral_count = total - positive_count - negative_count
         
         # Determine consensus
         if positive_count > negative_count * 2:
@@ -163,12 +285,13 @@ class RedditSearchTool(BaseTool):
             sentiment = "neutral"
         
         # Top subreddits
-        top_subreddits = sorted(subreddits.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_subreddits = subreddits.most_common(5)
         
         return {
             'consensus': consensus,
             'sentiment': sentiment,
             'top_subreddits': [{'name': name, 'posts': count} for name, count in top_subreddits],
+            'sample_posts': sample,
             'metrics': {
                 'total_posts': total,
                 'positive': positive_count,
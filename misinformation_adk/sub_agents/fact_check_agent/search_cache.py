@@ -0,0 +1,40 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class SearchCache:
+    """Thread-safe LRU cache of search result lists that expire after ttl seconds."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def key(self, query: str, max_results: int) -> tuple:
+        """Cache key for a search, ignoring case and surrounding whitespace."""
+        return (query.strip().lower(), max_results)
+    
+    def get(self, key: tuple) -> list:
+        """Return a copy of a fresh cached result list, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return list(results)
+    
+    def put(self, key: tuple, results: list):
+        """Cache a result list, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
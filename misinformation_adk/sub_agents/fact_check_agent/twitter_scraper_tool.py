@@ -1,8 +1,77 @@
 from google.adk.tools.base_tool import BaseTool
-import requests
 from bs4 import BeautifulSoup
+import asyncio
 import json
+import os
 import re
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+from .http_session import HEADERS, SESSION
+
+# List of Nitter instances (Twitter frontends)
+NITTER_INSTANCES = [
+    'https://nitter.net',
+    'https://nitter.poast.org',
+    'https://nitter.privacydev.net',
+    'https://nitter.cz'
+]
+
+# Mirrors scoring below this are only tried once the healthy ones fail
+MIRROR_MIN_SCORE = 0.2
+MIRROR_SCORE_WEIGHT = 0.3  # weight of the latest attempt in the running score
+MIRROR_STATS_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'nitter_stats.json')
+
+
+class _MirrorStats:
+    """Running success score per Nitter mirror, persisted between runs."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self._scores = json.load(f)
+        except (OSError, ValueError):
+            self._scores = {}
+    
+    def waves(self, instances: list) -> list:
+        """Instances split into [healthy, demoted], best first, dropping empty groups."""
+        with self._lock:
+            ranked = sorted(instances, key=lambda i: self._scores.get(i, 1.0), reverse=True)
+            healthy = [i for i in ranked if self._scores.get(i, 1.0) >= MIRROR_MIN_SCORE]
+        demoted = [i for i in ranked if i not in healthy]
+        return [wave for wave in (healthy, demoted) if wave]
+    
+    def record(self, instance: str, ok: bool):
+        """Fold the outcome of one request into the mirror's score."""
+        with self._lock:
+            old = self._scores.get(instance, 1.0)
+            self._scores[instance] = (1 - MIRROR_SCORE_WEIGHT) * old + MIRROR_SCORE_WEIGHT * (1.0 if ok else 0.0)
+    
+    def save(self):
+        """Write scores to disk; failures only cost the history."""
+        try:
+            with self._lock:
+                data = json.dumps(self._scores)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                f.write(data)
+        except OSError as e:
+            print(f"[TWITTER SCRAPER] Could not save mirror stats: {e}")
+
+
+_mirror_stats = _MirrorStats(MIRROR_STATS_PATH)
+
+# Keywords for sentiment analysis, matched against the tweet's words
+POSITIVE_KEYWORDS = frozenset(['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual'])
+NEGATIVE_KEYWORDS = frozenset(['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax'])
+WORD_PATTERN = re.compile(r"[a-z']+")
 
 class TwitterScraperTool(BaseTool):
     def __init__(self):
@@ -32,89 +101,190 @@ class TwitterScraperTool(BaseTool):
                 print("[TWITTER SCRAPER] Nitter failed, trying direct scrape...")
                 tweets = self._scrape_twitter_direct(query, max_results)
             
-            if not tweets:
-                return {
-                    "query": query,
-                    "tweets_analyzed": 0,
-                    "consensus": "NO_DATA",
-                    "sentiment": "neutral",
-                    "message": "No tweets found. Twitter scraping may be blocked or query returned no results."
-                }
+            return self._build_result(query, tweets)
             
-            # Analyze sentiment and consensus
-            analysis = self._analyze_tweets(tweets)
-            
-            return {
-                "query": query,
-                "tweets_analyzed": len(tweets),
-                "consensus": analysis['consensus'],
-                "sentiment": analysis['sentiment'],
-                "sample_tweets": tweets[:5],
-                "metrics": analysis['metrics'],
-                "source": "twitter_scraper"
-            }
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_async(self, query: str, max_results: int = 20, session=None) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        All Nitter instances are queried at once and the first one that
+        returns tweets wins.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of tweets to analyze
+            session: Optional aiohttp.ClientSession to share between calls
             
+        Returns:
+            Dictionary with tweet analysis and consensus
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.run, query, max_results)
+        
+        if session is None:
+            async with aiohttp.ClientSession(headers=HEADERS) as session:
+                return await self.run_async(query, max_results, session)
+        
+        try:
+            tweets = await self._scrape_nitter_async(session, query, max_results)
+            return self._build_result(query, tweets)
         except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_many(self, queries: list, max_results: int = 20) -> list:
+        """
+        Scrapes tweets for several queries concurrently.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of tweets to analyze per query
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.gather(*[self.run_async(q, max_results) for q in queries])
+        
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await asyncio.gather(*[self.run_async(q, max_results, session) for q in queries])
+    
+    def _build_result(self, query: str, tweets: list) -> dict:
+        """Analyze scraped tweets into the tool's response."""
+        if not tweets:
             return {
-                "error": str(e),
                 "query": query,
                 "tweets_analyzed": 0,
-                "consensus": "ERROR"
+                "consensus": "NO_DATA",
+                "sentiment": "neutral",
+                "message": "No tweets found. Twitter scraping may be blocked or query returned no results."
             }
+        
+        # Analyze sentiment and consensus
+        analysis = self._analyze_tweets(tweets)
+        
+        return {
+            "query": query,
+            "tweets_analyzed": len(tweets),
+            "consensus": analysis['consensus'],
+            "sentiment": analysis['sentiment'],
+            "sample_tweets": tweets[:5],
+            "metrics": analysis['metrics'],
+            "source": "twitter_scraper"
+        }
+    
+    def _error_result(self, query: str, e: Exception) -> dict:
+        """Response returned when scraping fails."""
+        return {
+            "error": str(e),
+            "query": query,
+            "tweets_analyzed": 0,
+            "consensus": "ERROR"
+        }
     
     def _scrape_nitter(self, query: str, max_results: int) -> list:
-        """Scrape Twitter via Nitter instance (no rate limits)."""
-        # List of Nitter instances (Twitter frontends)
-        nitter_instances = [
-            'https://nitter.net',
-            'https://nitter.poast.org',
-            'https://nitter.privacydev.net',
-            'https://nitter.cz'
-        ]
-        
-        for instance in nitter_instances:
+        """
+        Scrape Twitter via Nitter instances (no rate limits).
+        
+        Healthy instances are queried at once and the first one that
+        returns tweets wins, so dead mirrors cost at most one timeout.
+        Mirrors that have been failing are only tried if none answer.
+        """
+        def fetch(instance):
+            print(f"[TWITTER SCRAPER] Trying {instance}...")
             try:
-                url = f"{instance}/search"
-                params = {'f': 'tweets', 'q': query}
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                
-                print(f"[TWITTER SCRAPER] Trying {instance}...")
-                response = requests.get(url, params=params, headers=headers, timeout=10)
-                
-                if response.status_code != 200:
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                tweet_divs = soup.find_all('div', class_='timeline-item')
-                
-                if not tweet_divs:
-                    continue
-                
-                tweets = []
-                for div in tweet_divs[:max_results]:
-                    # Extract tweet content
-                    content_div = div.find('div', class_='tweet-content')
-                    username_link = div.find('a', class_='username')
-                    
-                    if content_div and username_link:
-                        tweets.append({
-                            'text': content_div.get_text(strip=True),
-                            'username': username_link.get_text(strip=True),
-                            'source': f'{instance}/scraper'
-                        })
-                
+                response = SESSION.get(f"{instance}/search", params={'f': 'tweets', 'q': query}, timeout=10)
+            except Exception:
+                _mirror_stats.record(instance, False)
+                raise
+            _mirror_stats.record(instance, response.status_code == 200)
+            if response.status_code != 200:
+                return []
+            return self._parse_nitter(response.content, instance, max_results)
+        
+        try:
+            for wave in _mirror_stats.waves(NITTER_INSTANCES):
+                executor = ThreadPoolExecutor(max_workers=len(wave))
+                futures = {executor.submit(fetch, instance): instance for instance in wave}
+                try:
+                    for future in as_completed(futures):
+                        instance = futures[future]
+                        try:
+                            tweets = future.result()
+                        except Exception as e:
+                            print(f"[TWITTER SCRAPER] {instance} failed: {e}")
+                            continue
+                        
+                        if tweets:
+                            print(f"[TWITTER SCRAPER] Found {len(tweets)} tweets from {instance}")
+                            return tweets
+                finally:
+                    # Don't wait for slower mirrors once we have an answer
+                    executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            _mirror_stats.save()
+        
+        return []
+    
+    async def _scrape_nitter_async(self, session, query: str, max_results: int) -> list:
+        """Async variant of _scrape_nitter: race healthy mirrors, then demoted ones."""
+        async def fetch(instance):
+            try:
+                async with session.get(f"{instance}/search", params={'f': 'tweets', 'q': query},
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    _mirror_stats.record(instance, response.status == 200)
+                    if response.status != 200:
+                        return []
+                    content = await response.read()
+                tweets = self._parse_nitter(content, instance, max_results)
                 if tweets:
                     print(f"[TWITTER SCRAPER] Found {len(tweets)} tweets from {instance}")
-                    return tweets
-                    
+                return tweets
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
+                _mirror_stats.record(instance, False)
                 print(f"[TWITTER SCRAPER] {instance} failed: {e}")
-                continue
+                return []
+        
+        try:
+            for wave in _mirror_stats.waves(NITTER_INSTANCES):
+                tasks = [asyncio.ensure_future(fetch(instance)) for instance in wave]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        tweets = await next_done
+                        if tweets:
+                            return tweets
+                finally:
+                    for task in tasks:
+                        task.cancel()
+        finally:
+            _mirror_stats.save()
         
         return []
     
+    def _parse_nitter(self, content: bytes, instance: str, max_results: int) -> list:
+        """Extract tweets from a Nitter search results page."""
+        soup = BeautifulSoup(content, 'lxml')
+        tweet_divs = soup.find_all('div', class_='timeline-item')
+        
+        tweets = []
+        for div in tweet_divs[:max_results]:
+            # Extract tweet content
+            content_div = div.find('div', class_='tweet-content')
+            username_link = div.find('a', class_='username')
+            
+            if content_div and username_link:
+                tweets.append({
+                    'text': content_div.get_text(strip=True),
+                    'username': username_link.get_text(strip=True),
+                    'source': f'{instance}/scraper'
+                })
+        
+        return tweets
+    
     def _scrape_twitter_direct(self, query: str, max_results: int) -> list:
         """
         Fallback: Try scraping Twitter directly (may be blocked).
@@ -132,28 +302,15 @@ class TwitterScraperTool(BaseTool):
                 'metrics': {}
             }
         
-        # Keywords for sentiment analysis
-        positive_keywords = ['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual']
-        negative_keywords = ['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax']
-        
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
+        total = len(tweets)
         
-        for tweet in tweets:
-            text = tweet.get('text', '').lower()
-            
-            has_positive = any(kw in text for kw in positive_keywords)
-            has_negative = any(kw in text for kw in negative_keywords)
-            
-            if has_positive and not has_negative:
-                positive_count += 1
-            elif has_negative and not has_positive:
-                negative_count += 1
-            else:
-                neutral_count += 1
+        words = [set(WORD_PATTERN.findall(tweet.get('text', '').lower())) for tweet in tweets]
+        has_positive = np.fromiter((not w.isdisjoint(POSITIVE_KEYWORDS) for w in words), dtype=bool, count=total)
+        has_negative = np.fromiter((not w.isdisjoint(NEGATIVE_KEYWORDS) for w in words), dtype=bool, count=total)
         
-        total = len(tweets)
+        positive_count = int((has_positive & ~has_negative).sum())
+        negative_count = int((has_negative & ~has_positive).sum())
+        neutral_count = total - positive_count - negative_count
         
         # Determine consensus
         if positive_count > negative_count * 2:
@@ -1,6 +1,38 @@
 from google.adk.tools.base_tool import BaseTool
 import requests
+import asyncio
 import os
+import re
+import numpy as np
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+from .http_session import HEADERS, UNCACHED_SESSION
+from .search_cache import SearchCache
+
+SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
+
+# Recent search rejects queries longer than this
+MAX_QUERY_LENGTH = 512
+BATCH_MAX_RESULTS = 100
+
+# Identical claims are often checked by several agents in a row; reuse
+# tweets for one rate-limit window instead of spending another request
+_search_cache = SearchCache(maxsize=512, ttl=900)
+
+# Keywords for sentiment analysis, matched as whole words in one scan per
+# tweet; the named group tells which side a match belongs to
+POSITIVE_KEYWORDS = ['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual']
+NEGATIVE_KEYWORDS = ['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax']
+SENTIMENT_PATTERN = re.compile(
+    r"\b(?:(?P<positive>" + '|'.join(POSITIVE_KEYWORDS) + r")|(?P<negative>" + '|'.join(NEGATIVE_KEYWORDS) + r"))\b",
+    re.IGNORECASE
+)
+
+# Words used to route tweets from a batched search back to their query
+WORD_PATTERN = re.compile(r"\w+")
 
 class TwitterSearchTool(BaseTool):
     def __init__(self):
@@ -28,100 +60,217 @@ class TwitterSearchTool(BaseTool):
         """
         try:
             if not self.bearer_token:
-                print("[WARNING] Twitter search skipped - no bearer token configured")
-                return {
-                    "error": "Twitter API not configured. Add TWITTER_BEARER_TOKEN to .env file.",
-                    "query": query,
-                    "consensus": "UNAVAILABLE",
-                    "tweets_analyzed": 0,
-                    "message": "Twitter/X API requires authentication. Please configure TWITTER_BEARER_TOKEN in .env file."
-                }
+                return self._not_configured_result(query)
             
             # Search recent tweets
-            tweets = self._search_tweets(query, max_results)
+            key = _search_cache.key(query, max_results)
+            tweets = _search_cache.get(key)
+            if tweets is None:
+                tweets = self._search_tweets(query, max_results)
+                if tweets:
+                    _search_cache.put(key, tweets)
             
-            if not tweets:
-                return {
-                    "query": query,
-                    "tweets_analyzed": 0,
-                    "consensus": "NO_DATA",
-                    "sentiment": "neutral",
-                    "message": "No tweets found. This could be due to: (1) No matching tweets, (2) Rate limit exceeded (Free tier = 1 request only), or (3) API access level restrictions."
-                }
+            return self._build_result(query, tweets)
             
-            # Analyze sentiment and consensus
-            analysis = self._analyze_tweets(tweets)
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_async(self, query: str, max_results: int = 20, session=None) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of tweets to analyze
+            session: Optional aiohttp.ClientSession to share between calls
             
-            return {
-                "query": query,
-                "tweets_analyzed": len(tweets),
-                "consensus": analysis['consensus'],
-                "sentiment": analysis['sentiment'],
-                "verified_users_opinion": analysis['verified_opinion'],
-                "sample_tweets": tweets[:5],  # Return sample
-                "metrics": analysis['metrics']
-            }
+        Returns:
+            Dictionary with tweet analysis and consensus
+        """
+        if not self.bearer_token:
+            return self._not_configured_result(query)
+        
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.run, query, max_results)
+        
+        if session is None:
+            async with aiohttp.ClientSession(headers=HEADERS) as session:
+                return await self.run_async(query, max_results, session)
+        
+        try:
+            key = _search_cache.key(query, max_results)
+            tweets = _search_cache.get(key)
+            if tweets is None:
+                tweets = await self._search_tweets_async(session, query, max_results)
+                if tweets:
+                    _search_cache.put(key, tweets)
+            
+            return self._build_result(query, tweets)
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_many(self, queries: list, max_results: int = 20) -> list:
+        """
+        Searches Twitter for several queries concurrently.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of tweets to analyze per query
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.gather(*[self.run_async(q, max_results) for q in queries])
+        
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await asyncio.gather(*[self.run_async(q, max_results, session) for q in queries])
+    
+    def run_batch(self, queries: list, max_results: int = 20) -> list:
+        """
+        Searches Twitter for several claims with as few API requests as possible.
+        
+        Duplicate queries are searched once. The rest are OR-ed together up to
+        the API's query length limit, and each returned tweet is credited to the
+        queries it shares the most words with. Matched tweets are cached per query.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of tweets to analyze per query
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not self.bearer_token:
+            return [self._not_configured_result(q) for q in queries]
+        
+        try:
+            keys = [_search_cache.key(q, max_results) for q in queries]
+            # First position of each distinct query -> its tweets
+            first_index = {}
+            tweets_by_query = {}
+            pending = []
+            for i, key in enumerate(keys):
+                if key in first_index:
+                    continue
+                first_index[key] = i
+                tweets_by_query[i] = _search_cache.get(key)
+                if tweets_by_query[i] is None:
+                    tweets_by_query[i] = []
+                    pending.append(i)
+            
+            for group in self._pack_queries([queries[i] for i in pending]):
+                indices = [pending[j] for j in group]
+                combined = ' OR '.join(f"({self._clean_query(queries[i])})" for i in indices)
+                tweets = self._search_tweets(combined, BATCH_MAX_RESULTS)
+                self._route_tweets(tweets, queries, indices, tweets_by_query)
+            
+            for i in pending:
+                tweets_by_query[i] = tweets_by_query[i][:max_results]
+                if tweets_by_query[i]:
+                    _search_cache.put(keys[i], tweets_by_query[i])
+            
+            return [self._build_result(q, tweets_by_query[first_index[key]][:max_results])
+                    for q, key in zip(queries, keys)]
             
         except Exception as e:
+            return [self._error_result(q, e) for q in queries]
+    
+    def _clean_query(self, query: str) -> str:
+        """Strip grouping characters so a query can be wrapped in parentheses."""
+        return ' '.join(query.replace('(', ' ').replace(')', ' ').split())[:MAX_QUERY_LENGTH - 2]
+    
+    def _pack_queries(self, queries: list) -> list:
+        """Greedily group query indexes so each OR-ed group fits in one request."""
+        groups = []
+        group, length = [], 0
+        for i, query in enumerate(queries):
+            term_length = len(self._clean_query(query)) + 2  # parentheses
+            added = term_length + (len(' OR ') if group else 0)
+            if group and length + added > MAX_QUERY_LENGTH:
+                groups.append(group)
+                group, length = [], 0
+                added = term_length
+            group.append(i)
+            length += added
+        if group:
+            groups.append(group)
+        return groups
+    
+    def _route_tweets(self, tweets: list, queries: list, indices: list, tweets_by_query: list):
+        """Append each tweet to every query in indices whose words it overlaps most."""
+        query_words = [(i, set(WORD_PATTERN.findall(queries[i].lower()))) for i in indices]
+        for tweet in tweets:
+            words = set(WORD_PATTERN.findall(tweet.get('text', '').lower()))
+            best, best_overlap = [], 0
+            for i, q_words in query_words:
+                overlap = len(words & q_words)
+                if overlap > best_overlap:
+                    best, best_overlap = [i], overlap
+                elif overlap and overlap == best_overlap:
+                    best.append(i)
+            for i in best:
+                tweets_by_query[i].append(tweet)
+    
+    def _not_configured_result(self, query: str) -> dict:
+        """Response returned when no bearer token is configured."""
+        print("[WARNING] Twitter search skipped - no bearer token configured")
+        return {
+            "error": "Twitter API not configured. Add TWITTER_BEARER_TOKEN to .env file.",
+            "query": query,
+            "consensus": "UNAVAILABLE",
+            "tweets_analyzed": 0,
+            "message": "Twitter/X API requires authentication. Please configure TWITTER_BEARER_TOKEN in .env file."
+        }
+    
+    def _build_result(self, query: str, tweets: list) -> dict:
+        """Analyze fetched tweets into the tool's response."""
+        if not tweets:
             return {
-                "error": str(e),
                 "query": query,
                 "tweets_analyzed": 0,
-                "consensus": "ERROR"
+                "consensus": "NO_DATA",
+                "sentiment": "neutral",
+                "message": "No tweets found. This could be due to: (1) No matching tweets, (2) Rate limit exceeded (Free tier = 1 request only), or (3) API access level restrictions."
             }
+        
+        # Analyze sentiment and consensus
+        analysis = self._analyze_tweets(tweets)
+        
+        return {
+            "query": query,
+            "tweets_analyzed": len(tweets),
+            "consensus": analysis['consensus'],
+            "sentiment": analysis['sentiment'],
+            "verified_users_opinion": analysis['verified_opinion'],
+            "sample_tweets": tweets[:5],  # Return sample
+            "metrics": analysis['metrics']
+        }
+    
+    def _error_result(self, query: str, e: Exception) -> dict:
+        """Response returned when the search fails."""
+        return {
+            "error": str(e),
+            "query": query,
+            "tweets_analyzed": 0,
+            "consensus": "ERROR"
+        }
     
     def _search_tweets(self, query: str, max_results: int) -> list:
         """Search tweets using Twitter API v2."""
         try:
-            url = "https://api.twitter.com/2/tweets/search/recent"
-            headers = {
-                "Authorization": f"Bearer {self.bearer_token}"
-            }
-            params = {
-                "query": query,
-                "max_results": min(max_results, 100),
-                "tweet.fields": "author_id,created_at,public_metrics,entities,text",
-                "expansions": "author_id",
-                "user.fields": "verified,public_metrics,username,name"
-            }
-            
             print(f"[TWITTER] Searching for: '{query}' (max {max_results} results)")
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            # Not the disk-caching session: results are cached in memory, and the
+            # bearer token must never reach the cache file
+            response = UNCACHED_SESSION.get(SEARCH_URL, headers=self._auth_headers(),
+                                            params=self._search_params(query, max_results), timeout=10)
             
             print(f"[TWITTER] Response status: {response.status_code}")
             
-            if response.status_code == 401:
-                print(f"[TWITTER ERROR] Authentication failed - invalid bearer token")
-                print(f"[TWITTER] Response: {response.text[:200]}")
-                return []
-            elif response.status_code == 403:
-                print(f"[TWITTER ERROR] Access forbidden - check API access level")
-                print(f"[TWITTER] Response: {response.text[:200]}")
-                return []
-            elif response.status_code == 429:
-                reset_time = response.headers.get('x-rate-limit-reset', 'unknown')
-                print(f"[TWITTER ERROR] Rate limit exceeded. Will reset at: {reset_time}")
-                print(f"[TWITTER] Free tier only allows 1 request. Upgrade to Basic ($100/month) for higher limits.")
-                return []
-            elif response.status_code != 200:
-                print(f"[TWITTER ERROR] API error {response.status_code}: {response.text[:200]}")
+            if not self._check_status(response.status_code, response.text, response.headers):
                 return []
             
-            data = response.json()
-            tweets = data.get('data', [])
-            
-            if not tweets:
-                print(f"[TWITTER] No tweets found for query: '{query}'")
-                return []
-            
-            users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
-            
-            # Enrich tweets with user data
-            for tweet in tweets:
-                tweet['user'] = users.get(tweet['author_id'], {})
-            
-            print(f"[TWITTER] Successfully retrieved {len(tweets)} tweets")
-            return tweets
+            return self._parse_tweets(query, response.json())
             
         except requests.exceptions.Timeout:
             print(f"[TWITTER ERROR] Request timeout")
@@ -133,6 +282,97 @@ class TwitterSearchTool(BaseTool):
             print(f"[TWITTER ERROR] Unexpected error: {type(e).__name__}: {e}")
             return []
     
+    async def _search_tweets_async(self, session, query: str, max_results: int) -> list:
+        """Async variant of _search_tweets using an aiohttp session."""
+        try:
+            print(f"[TWITTER] Searching for: '{query}' (max {max_results} results)")
+            async with session.get(SEARCH_URL, headers=self._auth_headers(),
+                                   params=self._search_params(query, max_results),
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                print(f"[TWITTER] Response status: {response.status}")
+                
+                if not self._check_status(response.status, await response.text(), response.headers):
+                    return []
+                
+                data = await response.json(content_type=None)
+            
+            return self._parse_tweets(query, data)
+            
+        except asyncio.TimeoutError:
+            print(f"[TWITTER ERROR] Request timeout")
+            return []
+        except aiohttp.ClientError as e:
+            print(f"[TWITTER ERROR] Network error: {e}")
+            return []
+        except Exception as e:
+            print(f"[TWITTER ERROR] Unexpected error: {type(e).__name__}: {e}")
+            return []
+    
+    def _auth_headers(self) -> dict:
+        """Bearer token header for the Twitter API."""
+        return {
+            "Authorization": f"Bearer {self.bearer_token}"
+        }
+    
+    def _search_params(self, query: str, max_results: int) -> dict:
+        """Query parameters for a recent search request."""
+        return {
+            "query": query,
+            "max_results": min(max_results, 100),
+            "tweet.fields": "author_id,created_at,public_metrics,entities,text",
+            "expansions": "author_id",
+            "user.fields": "verified,public_metrics,username,name"
+        }
+    
+    def _check_status(self, status: int, text: str, headers) -> bool:
+        """Log API errors; True if the response can be parsed."""
+        if status == 401:
+            print(f"[TWITTER ERROR] Authentication failed - invalid bearer token")
+            print(f"[TWITTER] Response: {text[:200]}")
+            return False
+        elif status == 403:
+            print(f"[TWITTER ERROR] Access forbidden - check API access level")
+            print(f"[TWITTER] Response: {text[:200]}")
+            return False
+        elif status == 429:
+            reset_time = headers.get('x-rate-limit-reset', 'unknown')
+            print(f"[TWITTER ERROR] Rate limit exceeded. Will reset at: {reset_time}")
+            print(f"[TWITTER] Free tier only allows 1 request. Upgrade to Basic ($100/month) for higher limits.")
+            return False
+        elif status != 200:
+            print(f"[TWITTER ERROR] API error {status}: {text[:200]}")
+            return False
+        return True
+    
+    def _parse_tweets(self, query: str, data: dict) -> list:
+        """Attach author details to the tweets in a search response."""
+        tweets = data.get('data', [])
+        
+        if not tweets:
+            print(f"[TWITTER] No tweets found for query: '{query}'")
+            return []
+        
+        users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
+        
+        # Enrich tweets with user data
+        for tweet in tweets:
+            tweet['user'] = users.get(tweet['author_id'], {})
+        
+        print(f"[TWITTER] Successfully retrieved {len(tweets)} tweets")
+        return tweets
+    
+    def _keyword_hits(self, text: str) -> tuple:
+        """Whether a tweet mentions positive and/or negative keywords."""
+        has_positive = has_negative = False
+        for match in SENTIMENT_PATTERN.finditer(text):
+            if match.lastgroup == 'positive':
+                has_positive = True
+            else:
+                has_negative = True
+            if has_positive and has_negative:
+                break
+        return has_positive, has_negative
+    
     def _analyze_tweets(self, tweets: list) -> dict:
         """Analyze tweet sentiment and consensus."""
         if not tweets:
@@ -143,35 +383,20 @@ class TwitterSearchTool(BaseTool):
                 'metrics': {}
             }
         
-        # Simple sentiment analysis based on keywords
-        positive_keywords = ['true', 'confirmed', 'verified', 'accurate', 'correct', 'factual']
-        negative_keywords = ['false', 'fake', 'misinformation', 'debunked', 'incorrect', 'hoax']
-        
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        verified_positive = 0
-        verified_negative = 0
+        total = len(tweets)
         
-        for tweet in tweets:
-            text = tweet.get('text', '').lower()
-            is_verified = tweet.get('user', {}).get('verified', False)
-            
-            has_positive = any(kw in text for kw in positive_keywords)
-            has_negative = any(kw in text for kw in negative_keywords)
-            
-            if has_positive and not has_negative:
-                positive_count += 1
-                if is_verified:
-                    verified_positive += 1
-            elif has_negative and not has_positive:
-                negative_count += 1
-                if is_verified:
-                    verified_negative += 1
-            else:
-                neutral_count += 1
+        # Simple sentiment analysis based on keywords: one (positive, negative) row per tweet
+        hits = np.array([self._keyword_hits(tweet.get('text', '')) for tweet in tweets], dtype=bool)
+        verified = np.fromiter((bool(tweet.get('user', {}).get('verified', False)) for tweet in tweets),
+                               dtype=bool, count=total)
         
-        total = len(tweets)
+        is_positive = hits[:, 0] & ~hits[:, 1]
+        is_negative = hits[:, 1] & ~hits[:, 0]
+        positive_count = int(is_positive.sum())
+        negative_count = int(is_negative.sum())
+        neutral_count = total - positive_count - negative_count
+        verified_positive = int((is_positive & verified).sum())
+        verified_negative = int((is_negative & verified).sum())
         
         # Determine consensus
         if positive_count > negative_count * 2:
@@ -1,8 +1,44 @@
 from google.adk.tools.base_tool import BaseTool
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import asyncio
 import json
+import time
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+try:
+    from duckduckgo_search import DDGS
+    DDGS_AVAILABLE = True
+except ImportError:
+    DDGS_AVAILABLE = False
+from .http_session import HEADERS, SESSION
+from .search_cache import SearchCache
+
+# DuckDuckGo library attempts before falling back to HTML scraping
+SEARCH_ATTEMPTS = 3
+
+# Only build the result blocks of a DuckDuckGo HTML page
+RESULT_STRAINER = SoupStrainer('div', class_='result')
+
+# Search results reused for an hour for repeated claims
+_search_cache = SearchCache(maxsize=512, ttl=3600)
+
+# A result is credible if its host is one of these domains or a subdomain
+# of one, or sits under a credible top-level domain or a credible label
+# directly under a country-code TLD (gov.in, nic.in, ac.uk, edu.au)
+CREDIBLE_DOMAINS = frozenset([
+    'wikipedia.org', 'reuters.com', 'apnews.com', 'bbc.com',
+    'nytimes.com', 'theguardian.com', 'npr.org', 'factcheck.org',
+    'snopes.com', 'politifact.com', 'nature.com',
+    'science.org', 'nih.gov', 'cdc.gov', 'mygov.in'
+])
+CREDIBLE_TLDS = frozenset(['gov', 'edu'])
+CREDIBLE_CCTLD_LABELS = frozenset(['gov', 'edu', 'ac', 'nic'])
 
 class WebSearchTool(BaseTool):
     def __init__(self):
@@ -25,76 +61,105 @@ class WebSearchTool(BaseTool):
         """
         try:
             # Use DuckDuckGo API (no API key required)
-            search_results = self._duckduckgo_search(query, num_results)
+            key = _search_cache.key(query, num_results)
+            search_results = _search_cache.get(key)
+            if search_results is None:
+                search_results = self._duckduckgo_search(query, num_results)
+                if search_results:
+                    _search_cache.put(key, search_results)
+            
+            return self._build_result(query, search_results)
             
-            # Analyze credibility of sources
-            credible_sources = self._analyze_source_credibility(search_results)
+        except Exception as e:
+            return self._error_result(query, e)
+    
+    async def run_async(self, query: str, num_results: int = 5, session=None) -> dict:
+        """
+        Async variant of run() that doesn't block the event loop.
+        
+        Args:
+            query: Search query
+            num_results: Number of results to return
+            session: Optional aiohttp.ClientSession for the HTML fallback
             
-            # Extract common facts
-            consensus = self._extract_consensus(search_results)
+        Returns:
+            Dictionary with search results and analysis
+        """
+        try:
+            key = _search_cache.key(query, num_results)
+            search_results = _search_cache.get(key)
+            if search_results is None:
+                search_results = await self._duckduckgo_search_async(session, query, num_results)
+                if search_results:
+                    _search_cache.put(key, search_results)
             
-            return {
-                "query": query,
-                "results": search_results,
-                "credible_sources": credible_sources,
-                "consensus": consensus,
-                "total_results": len(search_results)
-            }
+            return self._build_result(query, search_results)
             
         except Exception as e:
-            return {
-                "error": str(e),
-                "query": query,
-                "results": [],
-                "total_results": 0
-            }
+            return self._error_result(query, e)
+    
+    async def run_many(self, queries: list, num_results: int = 5) -> list:
+        """
+        Searches the web for several queries concurrently.
+        
+        Args:
+            queries: Search queries
+            num_results: Number of results to return per query
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.gather(*[self.run_async(q, num_results) for q in queries])
+        
+        async with aiohttp.ClientSession(headers=HEADERS) as session:
+            return await asyncio.gather(*[self.run_async(q, num_results, session) for q in queries])
+    
+    def _build_result(self, query: str, search_results: list) -> dict:
+        """Analyze search results into the tool's response."""
+        # Analyze credibility of sources
+        credible_sources = self._analyze_source_credibility(search_results)
+        
+        # Extract common facts
+        consensus = self._extract_consensus(search_results)
+        
+        return {
+            "query": query,
+            "results": search_results,
+            "credible_sources": credible_sources,
+            "consensus": consensus,
+            "total_results": len(search_results)
+        }
+    
+    def _error_result(self, query: str, e: Exception) -> dict:
+        """Response returned when the search fails."""
+        return {
+            "error": str(e),
+            "query": query,
+            "results": [],
+            "total_results": 0
+        }
     
     def _duckduckgo_search(self, query: str, num_results: int) -> list:
         """Perform DuckDuckGo search using official library with retry logic."""
         try:
-            # Try importing the library
-            try:
-                from duckduckgo_search import DDGS
-            except ImportError:
+            if not DDGS_AVAILABLE:
                 print("[WEB SEARCH ERROR] duckduckgo_search library not installed")
                 return self._duckduckgo_search_fallback(query, num_results)
             
             results = []
             
             # Retry logic for rate limiting
-            for attempt in range(3):
+            for attempt in range(SEARCH_ATTEMPTS):
                 try:
-                    # Initialize DDGS without context manager for better compatibility
-                    ddgs = DDGS()
-                    
-                    # Search with proper parameters
-                    search_results = list(ddgs.text(
-                        keywords=query,
-                        region='wt-wt',  # Worldwide
-                        safesearch='off',
-                        max_results=num_results
-                    ))
-                    
-                    print(f"[WEB SEARCH] DuckDuckGo returned {len(search_results)} raw results")
-                    
-                    for result in search_results:
-                        if len(results) >= num_results:
-                            break
-                        results.append({
-                            'title': result.get('title', ''),
-                            'url': result.get('href', result.get('link', '')),
-                            'snippet': result.get('body', result.get('description', '')),
-                            'date': datetime.now().strftime('%Y-%m-%d')
-                        })
-                    
+                    results = self._ddgs_text(query, num_results)
                     if results:
                         break  # Success!
                     
                 except Exception as e:
                     print(f"[WEB SEARCH] Attempt {attempt + 1} failed: {str(e)[:100]}")
-                    if attempt < 2:
-                        import time
-                        time.sleep(2)  # Wait before retry
+                    if attempt < SEARCH_ATTEMPTS - 1:
+                        time.sleep(2 ** attempt)  # Back off before retrying
                         continue
                     else:
                         print(f"[WEB SEARCH] All attempts failed, trying fallback...")
@@ -108,55 +173,133 @@ class WebSearchTool(BaseTool):
             # Fallback to scraping method
             return self._duckduckgo_search_fallback(query, num_results)
     
-    def _duckduckgo_search_fallback(self, query: str, num_results: int) -> list:
-        """Fallback DuckDuckGo search using HTML scraping."""
+    async def _duckduckgo_search_async(self, session, query: str, num_results: int) -> list:
+        """Async variant of _duckduckgo_search; the sync DDGS client runs in a worker thread."""
         try:
-            # Using DuckDuckGo's HTML search (no API key needed)
-            url = f"https://html.duckduckgo.com/html/?q={requests.utils.quote(query)}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if not DDGS_AVAILABLE:
+                print("[WEB SEARCH ERROR] duckduckgo_search library not installed")
+                return await self._duckduckgo_search_fallback_async(session, query, num_results)
             
             results = []
-            result_divs = soup.find_all('div', class_='result')[:num_results]
-            
-            for div in result_divs:
-                title_elem = div.find('a', class_='result__a')
-                snippet_elem = div.find('a', class_='result__snippet')
-                
-                if title_elem:
-                    results.append({
-                        'title': title_elem.get_text(strip=True),
-                        'url': title_elem.get('href', ''),
-                        'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
-                    })
             
+            # Retry logic for rate limiting
+            for attempt in range(SEARCH_ATTEMPTS):
+                try:
+                    results = await asyncio.to_thread(self._ddgs_text, query, num_results)
+                    if results:
+                        break  # Success!
+                    
+                except Exception as e:
+                    print(f"[WEB SEARCH] Attempt {attempt + 1} failed: {str(e)[:100]}")
+                    if attempt < SEARCH_ATTEMPTS - 1:
+                        await asyncio.sleep(2 ** attempt)  # Back off before retrying
+                        continue
+                    else:
+                        print(f"[WEB SEARCH] All attempts failed, trying fallback...")
+                        return await self._duckduckgo_search_fallback_async(session, query, num_results)
+            
+            print(f"[WEB SEARCH] Successfully found {len(results)} results for: {query}")
             return results
             
+        except Exception as e:
+            print(f"[WEB SEARCH ERROR] DuckDuckGo search failed: {e}")
+            return await self._duckduckgo_search_fallback_async(session, query, num_results)
+    
+    def _ddgs_text(self, query: str, num_results: int) -> list:
+        """One DuckDuckGo library search, formatted as result dicts."""
+        # Initialize DDGS without context manager for better compatibility
+        ddgs = DDGS()
+        
+        # Search with proper parameters
+        search_results = list(ddgs.text(
+            keywords=query,
+            region='wt-wt',  # Worldwide
+            safesearch='off',
+            max_results=num_results
+        ))
+        
+        print(f"[WEB SEARCH] DuckDuckGo returned {len(search_results)} raw results")
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        return [
+            {
+                'title': result.get('title', ''),
+                'url': result.get('href', result.get('link', '')),
+                'snippet': result.get('body', result.get('description', '')),
+                'date': today
+            }
+            for result in search_results[:num_results]
+        ]
+    
+    def _duckduckgo_search_fallback(self, query: str, num_results: int) -> list:
+        """Fallback DuckDuckGo search using HTML scraping."""
+        try:
+            response = SESSION.get(self._html_search_url(query), timeout=10)
+            return self._parse_html_results(response.content, num_results)
+            
+        except Exception as e:
+            print(f"DuckDuckGo search error: {e}")
+            return []
+    
+    async def _duckduckgo_search_fallback_async(self, session, query: str, num_results: int) -> list:
+        """Async variant of _duckduckgo_search_fallback using an aiohttp session."""
+        if session is None or not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self._duckduckgo_search_fallback, query, num_results)
+        
+        try:
+            async with session.get(self._html_search_url(query), timeout=aiohttp.ClientTimeout(total=10)) as response:
+                content = await response.read()
+            return self._parse_html_results(content, num_results)
+            
         except Exception as e:
             print(f"DuckDuckGo search error: {e}")
             return []
     
+    def _html_search_url(self, query: str) -> str:
+        """DuckDuckGo HTML search URL for a query (no API key needed)."""
+        return f"https://html.duckduckgo.com/html/?q={requests.utils.quote(query)}"
+    
+    def _parse_html_results(self, content: bytes, num_results: int) -> list:
+        """Extract up to num_results results from a DuckDuckGo HTML results page."""
+        soup = BeautifulSoup(content, 'lxml', parse_only=RESULT_STRAINER)
+        
+        results = []
+        result_divs = soup.find_all('div', class_='result')[:num_results]
+        
+        for div in result_divs:
+            title_elem = div.find('a', class_='result__a')
+            snippet_elem = div.find('a', class_='result__snippet')
+            
+            if title_elem:
+                results.append({
+                    'title': title_elem.get_text(strip=True),
+                    'url': title_elem.get('href', ''),
+                    'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
+                })
+        
+        return results
+    
     def _analyze_source_credibility(self, results: list) -> list:
         """Analyze credibility of sources."""
-        credible_domains = [
-            'wikipedia.org', 'reuters.com', 'apnews.com', 'bbc.com',
-            'nytimes.com', 'theguardian.com', 'npr.org', 'factcheck.org',
-            'snopes.com', 'politifact.com', 'gov', 'edu', 'nature.com',
-            'science.org', 'nih.gov', 'cdc.gov'
-        ]
-        
         credible = []
         for result in results:
-            url = result.get('url', '').lower()
-            if any(domain in url for domain in credible_domains):
+            parts = self._result_host(result.get('url', '')).split('.')
+            if (parts[-1] in CREDIBLE_TLDS
+                    or (len(parts) >= 2 and len(parts[-1]) == 2 and parts[-2] in CREDIBLE_CCTLD_LABELS)
+                    or any('.'.join(parts[i:]) in CREDIBLE_DOMAINS for i in range(len(parts)))):
                 credible.append(result)
         
         return credible
     
+    def _result_host(self, url: str) -> str:
+        """Lower-cased hostname of a result, looking through DuckDuckGo redirect links."""
+        parts = urlsplit(url)
+        # HTML fallback results link to //duckduckgo.com/l/?uddg=<target>
+        target = parse_qs(parts.query).get('uddg')
+        if target:
+            parts = urlsplit(target[0])
+        return (parts.hostname or '').rstrip('.')
+    
     def _extract_consensus(self, results: list) -> str:
         """Extract common themes from search results."""
         if not results:
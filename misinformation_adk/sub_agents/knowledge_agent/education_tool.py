@@ -1,16 +1,11 @@
 from google.adk.tools.base_tool import BaseTool
+from types import MappingProxyType
 
-class EducationTool(BaseTool):
-    def __init__(self):
-        super().__init__(
-            name="educate_user",
-            description="Provides educational content about misinformation detection and media literacy."
-        )
-        
-        self.education_topics = {
-            "deepfake": {
-                "title": "Understanding Deepfakes",
-                "content": """Deepfakes are AI-generated media (images, videos, audio) that convincingly mimic real people.
+# Built once at import and shared read-only by every EducationTool
+EDUCATION_TOPICS = MappingProxyType({
+    "deepfake": MappingProxyType({
+        "title": "Understanding Deepfakes",
+        "content": """Deepfakes are AI-generated media (images, videos, audio) that convincingly mimic real people.
 
 🔍 How to Spot Deepfakes:
 - Unnatural facial movements or blinking patterns
@@ -25,10 +20,10 @@ class EducationTool(BaseTool):
 - Check multiple credible news sources
 - Look for official verification marks
 """
-            },
-            "fact_checking": {
-                "title": "Effective Fact-Checking",
-                "content": """Learn how to verify information before believing or sharing it.
+    }),
+    "fact_checking": MappingProxyType({
+        "title": "Effective Fact-Checking",
+        "content": """Learn how to verify information before believing or sharing it.
 
 ✅ Best Practices:
 1. Check the Source: Is it credible and reputable?
@@ -44,10 +39,10 @@ class EducationTool(BaseTool):
 - Reuters Fact Check
 - AP Fact Check
 """
-            },
-            "media_literacy": {
-                "title": "Media Literacy Essentials",
-                "content": """Develop critical thinking skills for the digital age.
+    }),
+    "media_literacy": MappingProxyType({
+        "title": "Media Literacy Essentials",
+        "content": """Develop critical thinking skills for the digital age.
 
 🧠 Key Questions to Ask:
 - WHO created this content and why?
@@ -63,10 +58,10 @@ class EducationTool(BaseTool):
 - Appeals to strong emotions
 - Requests to "share before it's deleted"
 """
-            },
-            "social_media": {
-                "title": "Social Media Awareness",
-                "content": """Navigate social media responsibly.
+    }),
+    "social_media": MappingProxyType({
+        "title": "Social Media Awareness",
+        "content": """Navigate social media responsibly.
 
 📱 Social Media Tips:
 - Don't believe everything you see
@@ -82,10 +77,10 @@ class EducationTool(BaseTool):
 - Excessive sharing without original content
 - Suspicious follower/following ratios
 """
-            },
-            "cognitive_biases": {
-                "title": "Recognizing Cognitive Biases",
-                "content": """Understand how our minds can be tricked.
+    }),
+    "cognitive_biases": MappingProxyType({
+        "title": "Recognizing Cognitive Biases",
+        "content": """Understand how our minds can be tricked.
 
 🧩 Common Biases:
 - Confirmation Bias: Believing info that confirms existing beliefs
@@ -99,8 +94,18 @@ class EducationTool(BaseTool):
 - Separate facts from opinions
 - Consider alternative explanations
 """
-            }
-        }
+    })
+})
+
+
+class EducationTool(BaseTool):
+    def __init__(self):
+        super().__init__(
+            name="educate_user",
+            description="Provides educational content about misinformation detection and media literacy."
+        )
+        
+        self.education_topics = EDUCATION_TOPICS
     
     def run(self, topic: str = "general", analysis_context: dict = None) -> dict:
         """
@@ -116,7 +121,8 @@ class EducationTool(BaseTool):
         try:
             # Get base educational content
             if topic in self.education_topics:
-                education = self.education_topics[topic]
+                # Copy: the shared topic entries are read-only
+                education = dict(self.education_topics[topic])
             else:
                 education = self._get_general_education()
             